@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(PACKAGE_DIR, "element")
+
+class AssetRegistry:
+    """
+    Images of the game, read from disk once and shared by every window.
+    The relative paths ("element/RM.png") are resolved from the directory of the package, not from the working
+    directory. Each file is decoded once, and each scaled variant is kept by (path, size, alpha), ready to blit.
+    preload decodes files in a background thread, so the first window doesn't wait for the disk.
+    The returned surfaces are shared, they must not be modified.
+
+    Attributes:
+        sources: {path: Surface} of the decoded files, at their size.
+        images: {(path, size, alpha): Surface} of the scaled variants, converted to the format of the display.
+        pending: {path: Future} of the files being decoded by preload.
+        loads: Number of files read from disk.
+        hits: Number of images found in the cache.
+
+    Methods:
+        path(name): Returns the absolute path of an asset.
+        preload(names=None): Decodes the files in the background, every image of ASSETS_DIR by default.
+        image(name, size=None, alpha=True): Returns the image scaled to size (width, height), or at its size.
+            alpha keeps the transparency (convert_alpha), otherwise the image is opaque (convert).
+        clear(): Forgets every image.
+    """
+    def __init__(self):
+        self.sources = {}
+        self.images = {}
+        self.pending = {}
+        self.loads = 0
+        self.hits = 0
+        self.executor = None    # thread of preload, created on first use
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(PACKAGE_DIR, name))
+
+    def preload(self, names=None):
+        if names is None:
+            names = [os.path.join(ASSETS_DIR, f) for f in sorted(os.listdir(ASSETS_DIR)) if f.lower().endswith(".png")]
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        for name in names:
+            path = self.path(name)
+            if path not in self.sources and path not in self.pending:
+                self.pending[path] = self.executor.submit(self._decode, path)
+
+    def _decode(self, path):
+        # only reads the file : the conversion to the format of the display is done when the image is asked
+        self.loads += 1
+        return pygame.image.load(path)
+
+    def source(self, path):
+        surface = self.sources.get(path)
+        if surface is None:
+            future = self.pending.pop(path, None)
+            surface = future.result() if future is not None else self._decode(path)
+            self.sources[path] = surface
+        return surface
+
+    def image(self, name, size=None, alpha=True):
+        path = self.path(name)
+        key = (path, tuple(size) if size is not None else None, alpha)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        image = self.source(path)
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        self.images[key] = image
+        return image
+
+    def clear(self):
+        self.sources.clear()
+        self.images.clear()
+
+# shared by every window of the game
+default_assets = AssetRegistry()
+
+def load_image(name, size=None, alpha=True):
+    return default_assets.image(name, size, alpha)
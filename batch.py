@@ -0,0 +1,187 @@
+import argparse
+import math
+import multiprocessing
+import multiprocessing.util
+import random
+
+from schedule_cache import ScheduleCache
+from schedule_metrics import schedule_metrics
+from schedule_store import ScheduleStore
+from schedule_trace import RUN
+from task_sets import ALGORITHMS, DEFAULT_PARAMETERS, DIFFICULTY_LEVELS, generate_tasks, level_parameters, to_processes
+
+METRICS = ["waiting_time", "makespan", "deadline_misses", "response_time", "utilization", "context_switches",
+           "preemptions"]
+
+def evaluate(tasks, algorithms=None, quantum=4, horizon=None, store=None, instrument=False):
+    # runs every algorithm on the task set, returns {algorithm: {metric: value}}
+    # with a ScheduleStore, the schedules already stored are read instead of simulated
+    # with instrument, the counters and timings of the engine (EngineStats.as_dict) are added to the metrics
+    cache = ScheduleCache(max_entries=0, store=store) if store is not None else None
+    processes = to_processes(tasks) # the schedulers don't change them, every algorithm gets the same list
+    metrics = {}
+    for name in algorithms or ALGORITHMS:
+        scheduler = ALGORITHMS[name]
+        if name == "RR":
+            options = dict(quantum=quantum)
+        elif name in ("RM", "EDF"):
+            options = dict(horizon=horizon)
+        else:
+            options = {}
+        if instrument:
+            options['instrument'] = True
+        if cache is None:
+            result = scheduler(processes, **options)
+        else:
+            result = cache.run(scheduler, processes, **options)
+        end = result.trace.columns()['end'][result.trace.rows_of_kind(RUN)]
+        trace_values = schedule_metrics(result, processes)
+        metrics[name] = {
+            'waiting_time': result[2],
+            'makespan': int(end.max()) if len(end) > 0 else 0,
+            'deadline_misses': result.deadline_misses,
+            'response_time': trace_values.response_time,
+            'utilization': trace_values.utilization,
+            'context_switches': trace_values.context_switches,
+            'preemptions': trace_values.preemptions,
+        }
+        if instrument:
+            metrics[name].update(result.stats.as_dict())
+    return metrics
+
+_worker_store = None # store of the current process, opened by _open_store
+
+def _open_store(path):
+    # initializer of the pool workers, the pending schedules are written when the worker exits
+    global _worker_store
+    _worker_store = ScheduleStore(path) if path is not None else None
+    if _worker_store is not None:
+        multiprocessing.util.Finalize(_worker_store, _worker_store.close, exitpriority=10)
+
+def _evaluate_one(job):
+    # work item of the pool : the task set is drawn in the worker from its own seed
+    seed, parameters, algorithms, quantum, horizon, instrument = job
+    return evaluate(generate_tasks(random.Random(seed), parameters), algorithms, quantum, horizon, _worker_store,
+                    instrument)
+
+class Aggregate:
+    """
+    Running count, mean, standard deviation, min and max of a metric, without keeping the samples.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def std(self):
+        if self.count == 0:
+            return 0
+        return math.sqrt(max(0, self.total_squares / self.count - self.mean() ** 2))
+
+    def as_dict(self):
+        return {'mean': self.mean(), 'std': self.std(), 'min': self.min, 'max': self.max, 'count': self.count}
+
+def run_batch(count, difficulty=None, parameters=None, algorithms=None, seed=0, workers=None, chunksize=None,
+              quantum=4, horizon=None, store=None, instrument=False):
+    """
+    Generates count task sets and runs every algorithm on each of them over a process pool.
+
+    Args:
+        count: Number of task sets.
+        difficulty: Level of DIFFICULTY_LEVELS used to draw the task sets, or None for the default parameters.
+        parameters: Dict overriding some of the level parameters (min_thread, max_burst_time, ...).
+        algorithms: Names of the algorithms to run, all of ALGORITHMS by default.
+        seed: Task set i is drawn from random.Random(seed + i), so a batch can be reproduced.
+        workers: Number of worker processes, os.cpu_count() by default. 1 runs everything in this process.
+        chunksize: Number of task sets sent to a worker at once, computed from count and workers by default.
+        quantum: Quantum of RR.
+        horizon: End of the RM and EDF simulations, their hyperperiod by default.
+        store: Path of a ScheduleStore file. The schedules found there are not simulated again and the new
+            ones are added to it, so the same reference sets are only simulated once across runs.
+        instrument: Also aggregates the counters and timings of the engines (see schedule_stats.EngineStats).
+            The instrumented runs are slower and never read from the store.
+
+    Returns:
+        {algorithm: {metric: {'mean', 'std', 'min', 'max', 'count'}}} for every metric of METRICS,
+        and of EngineStats.as_dict with instrument.
+    """
+    parameters = level_parameters(difficulty, **(parameters or {}))
+    algorithms = list(algorithms or ALGORITHMS)
+    jobs = ((seed + i, parameters, algorithms, quantum, horizon, instrument) for i in range(count))
+    aggregates = {name: {} for name in algorithms}
+
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        _open_store(store)
+        outcomes = map(_evaluate_one, jobs)
+        pool = None
+    else:
+        chunksize = chunksize or max(1, count // (workers * 4))
+        pool = multiprocessing.Pool(workers, _open_store, (store,))
+        outcomes = pool.imap_unordered(_evaluate_one, jobs, chunksize)
+    try:
+        for metrics in outcomes:
+            for name, values in metrics.items():
+                for metric, value in values.items():
+                    aggregates[name].setdefault(metric, Aggregate()).add(value)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        elif _worker_store is not None:
+            _worker_store.close()
+
+    return {name: {metric: a.as_dict() for metric, a in by_metric.items()} for name, by_metric in aggregates.items()}
+
+def print_summary(summary):
+    # one row per metric, mean ± std of every algorithm
+    print(f"{'Metric':<20}" + "".join(f"{name:>22}" for name in summary))
+    for metric in METRICS:
+        cells = [f"{by_metric[metric]['mean']:>12.2f} ± {by_metric[metric]['std']:<8.2f}" for by_metric in summary.values()]
+        print(f"{metric:<20}" + "".join(cells))
+
+def print_stats(summary):
+    # mean of the engine counters and timings per task set, for a batch run with instrument
+    names = [metric for metric in next(iter(summary.values())) if metric not in METRICS]
+    print(f"\n{'Engine':<20}" + "".join(f"{name:>12}" for name in summary))
+    for metric in names:
+        cells = []
+        for by_metric in summary.values():
+            mean = by_metric[metric]['mean']
+            cells.append(f"{mean * 1000:>10.3f}ms" if metric.endswith("seconds") else f"{mean:>12.1f}")
+        print(f"{metric:<20}" + "".join(cells))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the scheduling algorithms on random task sets")
+    parser.add_argument("count", type=int, help="number of task sets")
+    parser.add_argument("--difficulty", type=int, choices=sorted(DIFFICULTY_LEVELS))
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--chunksize", type=int)
+    parser.add_argument("--quantum", type=int, default=4)
+    parser.add_argument("--horizon", type=int)
+    parser.add_argument("--store", help="SQLite file keeping the schedules between runs")
+    parser.add_argument("--stats", action="store_true", help="show the counters and timings of the engines")
+    for key in DEFAULT_PARAMETERS:
+        parser.add_argument("--" + key.replace("_", "-"), type=int, dest=key)
+    args = parser.parse_args()
+
+    overrides = {key: getattr(args, key) for key in DEFAULT_PARAMETERS if getattr(args, key) is not None}
+    summary = run_batch(args.count, args.difficulty, overrides, args.algorithms, args.seed, args.workers,
+                        args.chunksize, args.quantum, args.horizon, args.store, args.stats)
+    print_summary(summary)
+    if args.stats:
+        print_stats(summary)
@@ -0,0 +1,285 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+import process as pro
+from process import TaskSet
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+SIZES = (10, 100, 1000, 10000, 100000)    # numbers of tasks of the scaling curves
+VARIATION_SIZE = 1000                       # number of tasks of the cases where one parameter changes
+
+BURSTS = {"short": 10, "long": 1000}        # burst times are drawn from 1 to this value
+DENSITIES = {"dense": 2.0, "sparse": 0.5}   # work released per unit of time, above 1 the ready queue keeps growing
+SPREADS = {"narrow": 4, "wide": 64}         # longest period / shortest period
+UTILIZATION = 0.9                           # target utilization of the periodic task sets
+HORIZON_PERIODS = 2                         # RM and EDF are simulated over this number of longest periods
+
+# maximum slowdown (seconds) and growth (peak_bytes) accepted by --compare, stored in the baseline
+THRESHOLDS = {'seconds': 0.25, 'peak_bytes': 0.20}
+NOISE_FLOOR = 0.002         # seconds, faster cases are too noisy to be compared on time
+MIN_TIME = 0.2              # seconds, the fast cases are run again until they took that long
+
+SCHEDULERS = {
+    "FCFS": (pro.fcfs_scheduling, {}),
+    "SJN": (pro.sjn_scheduling, {}),
+    "RR": (pro.rr_scheduling, dict(quantum=4)),
+    "RM": (pro.rm_scheduling, {}),
+    "EDF": (pro.edf_scheduling, {}),
+}
+PERIODIC = ("RM", "EDF")    # the only schedulers that use the periods
+
+class Workload(namedtuple("Workload", ["size", "burst", "density", "periods", "spread"])):
+    """
+    Parameters of a generated task set. periods and spread are None for the non periodic schedulers,
+    density is None for the periodic ones, whose releases only depend on the periods.
+    """
+    __slots__ = ()
+
+    def name(self):
+        return " ".join(f"{field}={value}" for field, value in zip(self._fields, self) if value is not None)
+
+def _primes(low, high):
+    # prime numbers in [low, high], sieve of Eratosthenes
+    sieve = np.ones(high + 1, dtype=bool)
+    sieve[:2] = False
+    for i in range(2, math.isqrt(high) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = False
+    return np.flatnonzero(sieve[low:]) + low
+
+def generate(workload, seed=0):
+    """
+    Task set of the workload, always the same for the same workload and seed, whatever the other cases run.
+    Non periodic : arrivals spread so that DENSITIES[density] units of work arrive per unit of time.
+    Periodic : "harmonic" periods base * 2^k or "coprime" distinct prime periods, scaled so that the utilization
+    is about UTILIZATION, random phases, deadline = period.
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(workload.name().encode())])
+    n = workload.size
+    burst = rng.integers(1, BURSTS[workload.burst] + 1, n)
+    if workload.periods is None:
+        window = max(1, int(burst.sum() / DENSITIES[workload.density]))
+        arrival = rng.integers(0, window + 1, n)
+        return TaskSet(range(n), arrival, burst, 3 * burst, 2 * burst)
+
+    spread = SPREADS[workload.spread]
+    if workload.periods == "harmonic":
+        period = 2 ** rng.integers(0, int(math.log2(spread)) + 1, n)
+        period = period * math.ceil((burst / period).sum() / UTILIZATION)
+    else:
+        # shortest period such that n tasks with periods spread over [shortest, spread * shortest] have the target
+        # utilization : the mean of 1 / period over the interval is ln(spread) / ((spread - 1) * shortest)
+        shortest = math.ceil(burst.sum() * math.log(spread) / ((spread - 1) * UTILIZATION))
+        primes = _primes(max(shortest, 2), spread * max(shortest, 2))
+        period = rng.choice(primes, n, replace=len(primes) < n)
+        period = np.maximum(period, burst)
+    arrival = rng.integers(0, period)
+    return TaskSet(range(n), arrival, burst, period, period)
+
+def scheduler_options(algorithm, tasks):
+    scheduler, options = SCHEDULERS[algorithm]
+    if algorithm in PERIODIC:
+        options = dict(options, horizon=HORIZON_PERIODS * int(tasks.period.max()))
+    return scheduler, options
+
+def cases(algorithms=None, sizes=SIZES, variation_size=VARIATION_SIZE):
+    """
+    (algorithm, group, Workload) of the suite.
+    The "scaling" group runs every size with the default parameters, the "variation" group changes one parameter
+    at a time at variation_size, and the "coprime" group gives the scaling curve of RM and EDF with coprime periods.
+    """
+    for algorithm in algorithms or SCHEDULERS:
+        if algorithm in PERIODIC:
+            default = Workload(None, "short", None, "harmonic", "narrow")
+            variations = [dict(burst="long"), dict(spread="wide"), dict(periods="coprime", spread="wide")]
+        else:
+            default = Workload(None, "short", "dense", None, None)
+            variations = [dict(burst="long"), dict(density="sparse")]
+        for size in sizes:
+            yield algorithm, "scaling", default._replace(size=size)
+        for changes in variations:
+            yield algorithm, "variation", default._replace(size=variation_size, **changes)
+        if algorithm in PERIODIC:
+            for size in sizes:
+                yield algorithm, "coprime", default._replace(size=size, periods="coprime")
+
+def measure(algorithm, workload, seed=0, repeat=3, budget=1.0, memory=True):
+    """
+    Runs the scheduler on the task set of the workload and returns its measures.
+    The time kept is the best of at least repeat runs, fewer if the runs already took more than budget seconds,
+    more if they took less than MIN_TIME so the fast cases are not just noise.
+    The peak memory is measured by tracemalloc in one more run, as it slows the run down.
+    """
+    tasks = generate(workload, seed)
+    scheduler, options = scheduler_options(algorithm, tasks)
+    times = []
+    while True:
+        gc.collect()
+        start = time.perf_counter()
+        result = scheduler(tasks, **options)
+        times.append(time.perf_counter() - start)
+        elapsed = sum(times)
+        if elapsed > budget or (len(times) >= repeat and elapsed > MIN_TIME):
+            break
+    seconds = min(times)
+    events = len(result.trace)
+    del result
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        scheduler(tasks, **options)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'runs': len(times), 'events': events, 'peak_bytes': peak,
+            'tasks_per_second': workload.size / seconds if seconds else math.inf,
+            'events_per_second': events / seconds if seconds else math.inf}
+
+def run_suite(algorithms=None, sizes=SIZES, variation_size=VARIATION_SIZE, seed=0, repeat=3, budget=1.0,
+              memory=True, verbose=True):
+    """
+    Measures every case of the suite.
+
+    Returns:
+        {case name: measures} where the case name is "algorithm workload", with the algorithm, group and workload
+        of the case added to the measures of measure().
+    """
+    results = {}
+    for algorithm, group, workload in cases(algorithms, sizes, variation_size):
+        key = f"{algorithm} {workload.name()}"
+        if key in results:                  # same size given twice
+            continue
+        measures = measure(algorithm, workload, seed, repeat, budget, memory)
+        results[key] = dict(algorithm=algorithm, group=group, workload=workload._asdict(), **measures)
+        if verbose:
+            print_case(key, results[key])
+    return results
+
+def scaling_curves(results):
+    """
+    Time against the number of tasks for every algorithm and scaling group.
+
+    Returns:
+        {(algorithm, group): (sizes, seconds, exponent)} where exponent is the slope of log(seconds) against
+        log(size) : about 1 for a linear scheduler, 2 for a quadratic one.
+    """
+    points = {}
+    for measures in results.values():
+        if measures['group'] in ("scaling", "coprime"):
+            points.setdefault((measures['algorithm'], measures['group']), []).append(
+                (measures['workload']['size'], measures['seconds']))
+    curves = {}
+    for key, values in points.items():
+        values.sort()
+        sizes = [size for size, _ in values]
+        seconds = [s for _, s in values]
+        exponent = None
+        if len(values) > 1 and min(seconds) > 0:
+            exponent = float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+        curves[key] = (sizes, seconds, exponent)
+    return curves
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'processor': platform.processor(), 'system': platform.system(), 'engine_version': pro.ENGINE_VERSION}
+
+def save_baseline(results, path=DEFAULT_BASELINE, thresholds=None):
+    baseline = {'environment': environment(), 'thresholds': thresholds or THRESHOLDS, 'results': results}
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+def load_baseline(path=DEFAULT_BASELINE):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, baseline):
+    """
+    Compares the results with a baseline saved by save_baseline.
+    A case regresses when its time grows by more than thresholds['seconds'] (above NOISE_FLOOR) or its peak memory
+    by more than thresholds['peak_bytes']. A different number of events means the schedule itself changed.
+
+    Returns:
+        (regressions, changes), lists of (case name, message).
+    """
+    thresholds = baseline.get('thresholds', THRESHOLDS)
+    regressions, changes = [], []
+    for key, new in results.items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        if new['events'] != old['events']:
+            changes.append((key, f"{old['events']} -> {new['events']} events"))
+        ratio = new['seconds'] / old['seconds'] if old['seconds'] else math.inf
+        if ratio > 1 + thresholds['seconds'] and new['seconds'] > NOISE_FLOOR:
+            regressions.append((key, f"time x{ratio:.2f} ({old['seconds']:.4f}s -> {new['seconds']:.4f}s)"))
+        if new['peak_bytes'] and old.get('peak_bytes'):
+            ratio = new['peak_bytes'] / old['peak_bytes']
+            if ratio > 1 + thresholds['peak_bytes']:
+                regressions.append((key, f"memory x{ratio:.2f} ({old['peak_bytes']} -> {new['peak_bytes']} bytes)"))
+    return regressions, changes
+
+def _bytes(value):
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+def print_case(key, measures):
+    print(f"{key:<62}{measures['seconds']:>11.5f}s{measures['tasks_per_second']:>14.0f}{measures['events_per_second']:>14.0f}"
+          f"{_bytes(measures['peak_bytes']):>11}", flush=True)
+
+def print_header():
+    print(f"{'Case':<62}{'time':>12}{'tasks/s':>14}{'events/s':>14}{'peak':>11}")
+
+def print_curves(curves):
+    print("\nScaling curves")
+    for (algorithm, group), (sizes, seconds, exponent) in curves.items():
+        points = "  ".join(f"{size}: {s * 1000:.2f}ms" for size, s in zip(sizes, seconds))
+        slope = f"O(n^{exponent:.2f})" if exponent is not None else "-"
+        print(f"{algorithm:<6}{group:<9}{slope:<11}{points}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the schedulers of process.py")
+    parser.add_argument("--algorithms", nargs="+", choices=list(SCHEDULERS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="numbers of tasks of the scaling curves")
+    parser.add_argument("--variation-size", type=int, default=VARIATION_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the best time is kept")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds after which a case isn't run again")
+    parser.add_argument("--no-memory", action="store_true", help="don't measure the peak memory")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="write the results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare with a baseline")
+    args = parser.parse_args()
+
+    print_header()
+    results = run_suite(args.algorithms, args.sizes, args.variation_size, args.seed, args.repeat, args.budget,
+                        not args.no_memory)
+    print_curves(scaling_curves(results))
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline written to {args.save}")
+    if args.compare:
+        regressions, changes = compare(results, load_baseline(args.compare))
+        for key, message in changes:
+            print(f"changed schedule  {key} : {message}")
+        for key, message in regressions:
+            print(f"REGRESSION        {key} : {message}")
+        print(f"\n{len(regressions)} regression(s) against {args.compare}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,63 @@
+import pygame
+
+FRAME_RATE = 60     # default cap of the windows, in frames per second
+
+class FrameLoop:
+    """
+    Event loop shared by the windows, so that a static window doesn't use the cpu.
+    While the window is animating, it draws at most max_fps frames per second. Otherwise it sleeps in
+    pygame.event.wait and only draws again after an event.
+    After an event the whole window is drawn. A frame drawn only because of the animation is limited to the
+    dirty rectangles of the window: the drawing is clipped to them and only they are sent to the display.
+
+    Attributes:
+        max_fps: Maximum number of frames per second.
+        running: False once the window is closed or stop is called.
+        frames: Number of frames drawn.
+        clock: pygame.time.Clock pacing the frames.
+
+    Methods:
+        run(handle_event, draw, animating=None, dirty_rects=None): Runs the loop until stop or a QUIT event.
+            handle_event(event) is called for every event and draw() draws the whole window. animating()
+            returns True while the window changes without events, never by default. dirty_rects() returns
+            the rectangles that change during the animation, or None to draw everything.
+        stop(): Ends the loop after the current frame.
+    """
+    def __init__(self, max_fps=FRAME_RATE):
+        self.max_fps = max_fps
+        self.running = False
+        self.frames = 0
+        self.clock = pygame.time.Clock()
+
+    def run(self, handle_event, draw, animating=None, dirty_rects=None):
+        self.running = True
+        full = True                     # the first frame draws the whole window
+        while self.running:
+            if full or (animating is not None and animating()):
+                events = pygame.event.get()
+            else:
+                events = [pygame.event.wait()] + pygame.event.get()    # sleeps until something happens
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                handle_event(event)
+                full = True
+            if not self.running:
+                break
+
+            rects = None if full or dirty_rects is None else dirty_rects()
+            if rects is None:
+                draw()
+                pygame.display.flip()
+            elif rects:
+                screen = pygame.display.get_surface()
+                screen.set_clip(rects[0].unionall(rects[1:]))
+                draw()
+                screen.set_clip(None)
+                pygame.display.update(rects)
+            full = False
+            self.frames += 1
+            self.clock.tick(self.max_fps)
+
+    def stop(self):
+        self.running = False
@@ -1,13 +1,79 @@
+import math
+import numpy as np
 import pygame
 import time
 import random as rd
 import process as pro
-from process import Process
+import schedulability
+from process import TaskSet
+from schedule_trace import TraceRows
+from task_sets import ALGORITHMS, DIFFICULTY_LEVELS, generate_tasks
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from schedule_cache import default_cache
+from schedule_metrics import schedule_metrics
+from text_cache import get_font, render_text
+from scene_manager import open_display
+from assets import load_image
 import window as wd
-import sys
-import os
 
 launch = False
+_executors = {}     # {algorithm: pool of one worker process}, the worker keeps the checkpoints of its last schedule
+gantt_colors = {}   # rank of each process name in the colors of the Gantt charts
+# short verdicts of schedulability.check in the results table, "-" for the algorithms without a test
+VERDICT_LABELS = {schedulability.SCHEDULABLE: "yes", schedulability.NOT_SCHEDULABLE: "no", schedulability.UNKNOWN: "?"}
+
+def simulation_executor(algo):
+    """
+    Worker process of an algorithm, to run its schedules without blocking the event loop. It is created on first use,
+    so each selected algorithm gets its own process, and it keeps the checkpoints of the last schedule of the algorithm
+    (process.reschedule_kept) : after an edit the simulation resumes from them, without sending them back and forth.
+    """
+    if not _executors:
+        pygame.register_quit(shutdown_simulations)     # pygame.quit forgets it, registered again with the next pool
+    if algo not in _executors:
+        _executors[algo] = ProcessPoolExecutor(max_workers=1)
+    return _executors[algo]
+
+def shutdown_simulations(algorithms=None):
+    """
+    Stops the workers of simulation_executor (of the given algorithms, all of them by default) without waiting for
+    them, when the game is closed : the pending simulations are cancelled and the workers still running one are
+    terminated, otherwise Python would wait for the end of a long RM / EDF run before exiting.
+    The next simulation of an algorithm creates a new worker, which starts without checkpoints.
+    """
+    for algo in list(_executors) if algorithms is None else algorithms:
+        executor = _executors.pop(algo, None)
+        if executor is None:
+            continue
+        workers = list((executor._processes or {}).values())   # no public access before Python 3.14 (terminate_workers)
+        executor.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            if worker.is_alive():
+                worker.kill()      # not terminate : the workers inherit the SDL handler that ignores SIGTERM
+
+def submit_simulation(algo, fn, *args):
+    """
+    Runs fn(*args) in the worker of algo. A worker that died (killed, out of memory, ...) leaves its pool broken :
+    it is replaced by a new one, and if that fails too the returned future holds the error, so the simulation is
+    reported as failed instead of raising in the event loop.
+    """
+    for attempt in range(2):
+        try:
+            return simulation_executor(algo).submit(fn, *args)
+        except BrokenProcessPool as e:
+            shutdown_simulations([algo])
+            error = e
+    future = Future()
+    future.set_exception(error)
+    return future
+
+def cancel_simulations(simulations):
+    # simulations nobody will read, as (algorithm, future) : the pending ones are cancelled, and the workers of the
+    # ones already running are stopped, so the next launch doesn't wait behind them
+    running = [algo for algo, future in simulations if not future.cancel() and not future.done()]
+    if running:
+        shutdown_simulations(running)
 
 class Button:
     """
@@ -36,7 +102,7 @@ class Button:
         self.text_color_hover = text_color_hover
         self.action = action
         self.hover = False
-        self.text_surface = self.font.render(self.text, True, self.text_color)
+        self.text_surface = render_text(self.font, self.text, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
 
     def draw(self, screen):
@@ -65,7 +131,7 @@ class Button:
 
     def set_text(self, new_text):
         self.text = new_text
-        self.text_surface = self.font.render(new_text, True, self.text_color)
+        self.text_surface = render_text(self.font, new_text, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         print("Done")
 
@@ -75,27 +141,26 @@ class Button:
 
     def set_text_color(self, text_color):
         self.text_color = text_color
-        self.text_surface = self.font.render(text_color, True, self.text_color)
+        self.text_surface = render_text(self.font, text_color, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         print("Done")
 
     def set_text_color_hover(self, text_color_hover):
         self.text_color_hover = text_color_hover
-        self.text_surface = self.font.render(text_color_hover, True, self.text_color)
+        self.text_surface = render_text(self.font, text_color_hover, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         print("Done")
 
     def set_font(self, font):
-        self.font = font
-        self.text_surface = self.font.render(self.text, True, self.text_color)
+        self.font = font    # the texts of the previous font stay in the cache until evicted
+        self.text_surface = render_text(self.font, self.text, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         print("Done")
 
 class ImageButton:
     def __init__(self, x, y, file, size_x, size_y,name, action = None):
         self.rect = pygame.Rect(x, y, size_x, size_y)
-        self.image = pygame.image.load(file).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (size_x, size_y))
+        self.image = load_image(file, (size_x, size_y))    # loaded once, shared by every window
         self.action = action
         self.actif = True
         self.is_clicked = False
@@ -129,6 +194,7 @@ class Thread:
         font (Font): Font object used for text rendering.
         couleur (tuple): RGB tuple representing the color of rendered text.
         thread (list): A list of generated process dictionaries.
+        tasks (TaskSet): The same processes as columns, built from thread when get_tasks first needs it.
         min_thread (int): Minimum number of threads in a level.
         max_thread (int): Maximum number of threads in a level.
         min_arrival_time (int): Minimum arrival time for process generation.
@@ -152,6 +218,15 @@ class Thread:
         get_difficulty():
             Returns the current difficulty level.
 
+        get_tasks():
+            Returns the processes as a TaskSet, built once and shared by every scheduler.
+
+        get_thread():
+            Returns the processes as a new list of Process.
+
+        get_width():
+            Returns the width of the table drawn by draw.
+
         reset():
             Resets the generated thread list to an empty state.
 
@@ -169,6 +244,7 @@ class Thread:
         self.font = font
         self.couleur = couleur
         self.thread = []
+        self.tasks = None
         self.min_thread = 3
         self.max_thread = 20
         self.min_arrival_time = 0
@@ -178,42 +254,20 @@ class Thread:
         self.min_period = 0
         self.max_period = 15
         self.difficulty = 1
+        self.column_widths = [50, 80, 80, 50, 80]
+        self.padding = 10
 
     def create_thread(self):
-        number_of_process = rd.randint(self.min_thread, self.max_thread)
-        for i in range(number_of_process):
-            burst_time = rd.randint(self.min_burst_time, self.max_burst_time)
-            process = dict(name="L" + str(i),
-                           arrival_time=rd.randint(self.min_arrival_time, self.max_arrival_time),
-                           burst_time=burst_time,
-                           period=rd.randint(self.min_period, self.max_period),
-                           deadline=2 * burst_time)
-            self.thread.append(process)
+        self.thread.extend(generate_tasks(rd, vars(self)))
+        self.tasks = None
 
     def create_custom_thread(self,data):
         self.thread = data
+        self.tasks = None
 
     def adjust_to_difficulty(self):
-        if self.difficulty == 1:
-            self.min_thread = 3
-            self.max_thread = 5
-            self.max_arrival_time = 5
-            self.max_period = 0
-        elif self.difficulty == 2:
-            self.min_thread = 5
-            self.max_thread = 10
-            self.max_arrival_time = 10
-            self.max_period = 0
-        elif self.difficulty == 3:
-            self.min_thread = 10
-            self.max_thread = 15
-            self.max_arrival_time = 20
-            self.max_period = 5
-        elif self.difficulty == 4:
-            self.min_thread = 15
-            self.max_thread = 20
-            self.max_arrival_time = 30
-            self.max_period = 15
+        for key, value in DIFFICULTY_LEVELS.get(self.difficulty, {}).items():
+            setattr(self, key, value)
 
     def set_difficulty(self, difficulty):
         self.difficulty = difficulty
@@ -224,18 +278,24 @@ class Thread:
 
     def reset(self):
         self.thread = []
+        self.tasks = None
 
     def create_level(self):
         self.adjust_to_difficulty()
         self.create_thread()
         return self.thread
 
+    def get_tasks(self):
+        # the schedulers don't change the task set, it is shared by every algorithm
+        if self.tasks is None:
+            self.tasks = TaskSet.from_dicts(self.thread)
+        return self.tasks
+
     def get_thread(self):
-        thread_dict = self.thread
-        thread_list = []
-        for i in thread_dict:
-            thread_list.append(Process(i['name'], i['arrival_time'], i['burst_time'], i['period'], i['deadline']))
-        return thread_list
+        return self.get_tasks().processes()
+
+    def get_width(self):
+        return sum(self.column_widths) + self.padding * (len(self.column_widths) - 1)
 
     def draw(self, screen):
         header_color = (68, 114, 196, 255)
@@ -243,8 +303,8 @@ class Thread:
         # Dessiner l'en-tête du tableau
         header_labels = ["Name", "Arrival time", "Burst time", "Period", "Deadline"]
         x_offset = self.x
-        padding = 10
-        column_widths = [50, 80, 80, 50, 80]
+        padding = self.padding
+        column_widths = self.column_widths
         header_height = self.size + 10
 
         # Dessiner le rectangle de l'en-tête
@@ -254,7 +314,7 @@ class Thread:
         # Afficher le texte de l'en-tête
         header_text_color = (0, 0, 0)  # Couleur du texte de l'en-tête
         for i, label in enumerate(header_labels):
-            text_surface = self.font.render(label, True, header_text_color)
+            text_surface = render_text(self.font, label, header_text_color)
             text_rect = text_surface.get_rect(
                 topleft=(x_offset + padding // 2, self.y + (header_height - text_surface.get_height()) // 2))
             screen.blit(text_surface, text_rect)
@@ -273,7 +333,7 @@ class Thread:
             pygame.draw.rect(screen, row_color, row_rect)
 
             for j, value in enumerate(data):
-                text_surface = self.font.render(value, True, self.couleur)
+                text_surface = render_text(self.font, value, self.couleur)
                 text_rect = text_surface.get_rect(
                     topleft=(x_offset + padding // 2, y_offset + (self.size - text_surface.get_height()) // 2))
                 screen.blit(text_surface, text_rect)
@@ -292,12 +352,10 @@ class Image:
         self.rect = self.image.get_rect(topleft=(x, y))
 
     def _load_image(self):
+        # l'image et sa taille sont gardées par default_assets : elles ne sont lues et redimensionnées qu'une fois
         try:
-            if self.alpha:
-                image = pygame.image.load(self.filepath).convert_alpha()
-            else:
-                image = pygame.image.load(self.filepath).convert()
-        except pygame.error as e:
+            original = load_image(self.filepath, alpha=bool(self.alpha))
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Erreur lors du chargement de l'image : {self.filepath}")
             print(f"Erreur Pygame : {e}")
             # Retourne une surface noire de 1x1 pour éviter les erreurs.
@@ -305,17 +363,17 @@ class Image:
 
         if self.size_x is not None and self.size_y is not None:
             try:
-                image = pygame.transform.scale(image, (self.size_x, self.size_y))
+                return load_image(self.filepath, (self.size_x, self.size_y), bool(self.alpha))
             except TypeError:
                 print(
                     f"Erreur : Les arguments 'size_x' et 'size_y' doivent être des entiers. Image : {self.filepath}")
                 # Retourne l'image originale
-                return image
+                return original
             except ValueError:
                 print(
                     f"Erreur : Les arguments 'size_x' et 'size_y' doivent être positifs. Image: {self.filepath}")
-                return image
-        return image
+                return original
+        return original
 
     def draw(self, surface, position=None):  # position est maintenant optionnel
         if position is None:
@@ -384,24 +442,24 @@ class outList:
         self.x = x
         self.y = y
         self.size = size
-        self.ordered_list = []
-        self.font = pygame.font.Font(None, self.size)  # Initialize the font
+        self.font = get_font(None, self.size)
         self.current_time = 0
         self.start_display_time = time.time()
         self.displayed_index = 0
 
-    def transform_list(self):
-        for item in self.list:
-            if len(item) >= 3:
-                label = item[0]
-                start = item[1]
-                end = item[2]
-                for _ in range(end - start):
-                    self.ordered_list.append(label)
-        print(self.ordered_list)
-
     def convert_list(self):
         dictionnaire_sortie = {}
+        if isinstance(self.list, TraceRows):
+            # trace columnaire : le temps de chaque évènement est dans la colonne end, pas de -10 à retirer
+            trace = self.list.trace
+            columns = trace.columns()
+            pids = columns['pid'][self.list.rows].tolist()
+            times = columns['end'][self.list.rows].tolist()
+            del columns
+            for index, valeur in zip(pids, times):
+                dictionnaire_sortie.setdefault(trace.pids[index], []).append(valeur)
+            self.dict = dictionnaire_sortie
+            return
         for sous_liste in self.list:
             if sous_liste:
                 cle = sous_liste[0]
@@ -411,20 +469,6 @@ class outList:
                 dictionnaire_sortie[cle].extend(valeurs)
         self.dict = {k: v for k, v in dictionnaire_sortie.items() if v}
 
-    def draw_order(self, screen):
-        background_color = (207, 213, 234, 255)
-        x_offset = 0
-        current_display_time = time.time()
-        elapsed_time = (current_display_time - self.start_display_time) * 1000  # Convert to milliseconds
-
-        items_to_display = int(elapsed_time // self.time)
-
-        for i in range(min(items_to_display, len(self.ordered_list))):
-            item = self.ordered_list[i]
-            text_surface = self.font.render(str(item), True, self.color, background_color)
-            screen.blit(text_surface, (self.x + x_offset, self.y))
-            x_offset += self.font.get_linesize()
-
     def draw_dict(self, screen):
         background_color = (207, 213, 234, 255)
         x_offset = 0
@@ -440,7 +484,7 @@ class outList:
 
                 # Utiliser le temps écoulé pour déterminer quoi afficher
                 if start_time <= elapsed_time <= end_time:
-                    text_surface = self.font.render(f"{key}", True, self.color, background_color)
+                    text_surface = render_text(self.font, f"{key}", self.color, background_color)
                     screen.blit(text_surface, (self.x + x_offset, self.y))
                     x_offset += self.font.get_linesize()
 
@@ -448,6 +492,103 @@ class outList:
         if not hasattr(self, 'start_display_time'):
             self.start_display_time = time.time()
 
+    def finished(self):
+        # vrai quand draw_dict n'affiche plus rien de nouveau : après la sortie du dernier processus
+        last = max((times[1] for times in self.dict.values() if len(times) >= 2), default=0)
+        return (time.time() - self.start_display_time) * 1000 / self.time > last + 1
+
+    def get_rect(self):
+        # zone où draw_dict peut écrire : une étiquette par processus au plus, la dernière peut être plus large
+        widest = max((self.font.size(f"{key}")[0] for key in self.dict), default=0)
+        return pygame.Rect(self.x, self.y, self.font.get_linesize() * max(0, len(self.dict) - 1) + widest,
+                           self.font.get_height())
+
+class GanttChart:
+    """
+    Gantt chart of the execution slices of a schedule, revealed one time unit every time_interval milliseconds.
+    The slices are drawn once on an offscreen surface, one colored bar per slice labelled with its process when
+    it is wide enough : a frame only blits the revealed part of it, whatever the number of slices.
+
+    Attributes:
+        time: Milliseconds between two revealed time units.
+        x, y: Position of the chart on the screen.
+        height: Height of the bars.
+        scale: Width of a time unit in pixels, unit_width or less so that the whole schedule fits in max_width.
+        span: End of the last slice.
+        surface: The rendered chart.
+        start_display_time: Time the animation started.
+
+    Methods:
+        render(pid, start, end, names): Draws the slices on the surface.
+        draw(screen): Blits the revealed part of the chart.
+        finished(): Returns True once the whole chart is revealed.
+        get_rect(): Returns the area of the chart on the screen.
+    """
+    def __init__(self, results, time_interval, x, y, height=20, max_width=1000, unit_width=21,
+                 background_color=(207, 213, 234, 255)):
+        self.time = time_interval
+        self.x = x
+        self.y = y
+        self.height = height
+        self.background_color = background_color
+        self.font = get_font(None, height + 4)
+        pid, start, end, names = self._slices(results)
+        self.span = int(end.max()) if len(end) > 0 else 0
+        self.scale = unit_width if self.span * unit_width <= max_width else max_width / self.span
+        self.surface = pygame.Surface((max(1, math.ceil(self.span * self.scale)), height))
+        self.render(pid, start, end, names)
+        self.start_display_time = time.time()
+
+    @staticmethod
+    def _slices(results):
+        # (pid, start, end) columns of the slices, and the name of each pid
+        if isinstance(results, TraceRows):
+            columns = results.trace.columns()
+            return (columns['pid'][results.rows], columns['start'][results.rows], columns['end'][results.rows],
+                    results.trace.pids)
+        names = list(dict.fromkeys(item[0] for item in results))
+        index = {name: i for i, name in enumerate(names)}
+        pid = np.array([index[item[0]] for item in results], dtype=np.int64)
+        start = np.array([item[1] for item in results], dtype=np.int64)
+        end = np.array([item[2] for item in results], dtype=np.int64)
+        return pid, start, end, names
+
+    def render(self, pid, start, end, names):
+        self.surface.fill(self.background_color)
+        left = np.floor(start * self.scale).astype(np.int64)
+        right = np.maximum(left + 1, np.floor(end * self.scale).astype(np.int64))
+        # slices narrower than a pixel : only the last one starting in a column of pixels is visible
+        keep = np.flatnonzero(np.r_[left[1:] != left[:-1], True]) if len(left) > 0 else left
+        for i, x0, x1 in zip(pid[keep].tolist(), left[keep].tolist(), right[keep].tolist()):
+            bar = pygame.Rect(x0, 0, x1 - x0, self.height)
+            pygame.draw.rect(self.surface, self._color(names[i]), bar)
+            if bar.width >= 4:
+                pygame.draw.rect(self.surface, (0, 0, 0), bar, 1)
+            label = render_text(self.font, str(names[i]), (0, 0, 0))
+            if label.get_width() + 2 <= bar.width:
+                self.surface.blit(label, label.get_rect(center=bar.center))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+
+    @staticmethod
+    def _color(name):
+        # hues in order of first appearance, golden angle apart : a process has the same color on every chart
+        color = pygame.Color(0, 0, 0)
+        color.hsva = (gantt_colors.setdefault(name, len(gantt_colors)) * 137.508 % 360, 40, 95, 100)
+        return color
+
+    def draw(self, screen):
+        elapsed = int((time.time() - self.start_display_time) * 1000 / self.time)     # revealed time units
+        width = min(self.surface.get_width(), int(min(elapsed, self.span) * self.scale))
+        if width > 0:
+            screen.blit(self.surface, (self.x, self.y), pygame.Rect(0, 0, width, self.height))
+
+    def finished(self):
+        return (time.time() - self.start_display_time) * 1000 / self.time > self.span + 1
+
+    def get_rect(self):
+        return pygame.Rect(self.x, self.y, self.surface.get_width(), self.height)
+
 class Rectangle:
     def __init__(self, x, y, width, height, color=(255, 255, 255)):
         self.rect = pygame.Rect(x, y, width, height)
@@ -467,11 +608,11 @@ class Text:
         self.font = font
 
     def draw(self, screen):
-        text_surface = self.font.render(self.text, True, self.color)
-        screen.blit(text_surface, (self.x, self.y))
+        screen.blit(render_text(self.font, self.text, self.color), (self.x, self.y))
 
 class TableauAffichage:
-    def __init__(self, screen, x, y, headers, data, header_color=(68, 114, 196, 255), row_color=(207, 213, 234, 255)):
+    def __init__(self, screen, x, y, headers, data, header_color=(68, 114, 196, 255), row_color=(207, 213, 234, 255),
+                 font_size=24):
         """
         Initialise la classe TableauAffichage.
 
@@ -484,6 +625,7 @@ class TableauAffichage:
                   et les clés correspondent aux titres des colonnes.
             header_color: La couleur RVBA de l'arrière-plan des en-têtes.
             row_color: La couleur RVBA de l'arrière-plan des lignes de données.
+            font_size: La taille de la police, à réduire quand le tableau a beaucoup de colonnes.
         """
         self.screen = screen
         self.x = x
@@ -492,7 +634,7 @@ class TableauAffichage:
         self.data = data
         self.header_color = header_color
         self.row_color = row_color
-        self.font = pygame.font.Font(None, 24)  # Vous pouvez choisir une autre police et taille
+        self.font = get_font(None, font_size)  # Vous pouvez choisir une autre police
 
         self.cell_padding = 5
         self.column_widths = self._calculate_column_widths()
@@ -520,7 +662,7 @@ class TableauAffichage:
         for i, header in enumerate(self.headers):
             header_rect = pygame.Rect(current_x, current_y, self.column_widths[i], self.row_height)
             pygame.draw.rect(self.screen, self.header_color, header_rect)
-            text_surface = self.font.render(header, True, (0, 0, 0))  # Couleur du texte noir
+            text_surface = render_text(self.font, header, (0, 0, 0))  # Couleur du texte noir
             text_rect = text_surface.get_rect(center=header_rect.center)
             self.screen.blit(text_surface, text_rect)
             current_x += self.column_widths[i]
@@ -533,7 +675,7 @@ class TableauAffichage:
                 cell_rect = pygame.Rect(current_x, current_y, self.column_widths[i], self.row_height)
                 pygame.draw.rect(self.screen, self.row_color, cell_rect)
                 cell_value = str(row_data.get(header, ""))
-                text_surface = self.font.render(cell_value, True, (0, 0, 0))
+                text_surface = render_text(self.font, cell_value, (0, 0, 0))
                 text_rect = text_surface.get_rect(center=cell_rect.center)
                 self.screen.blit(text_surface, text_rect)
                 current_x += self.column_widths[i]
@@ -542,6 +684,7 @@ class TableauAffichage:
 class ProcessCreator:
     """
     Une classe qui gère la création et l'affichage de processus personnalisés dans une fenêtre Pygame.
+    C'est une scène de window.manager (voir scene_manager.SceneManager) : Echap revient à l'écran précédent.
     """
     def __init__(self):
         """
@@ -549,19 +692,19 @@ class ProcessCreator:
         la taille du tableau, les en-têtes de colonne, les rectangles des zones de saisie et des boutons,
         et les variables pour stocker les données et l'état de l'entrée.
         """
-        pygame.init()
         self.window_width = 800
         self.window_height = 600
-        self.screen = pygame.display.set_mode((self.window_width, self.window_height))
-        pygame.display.set_caption("Create custom process")
+        self.size = (self.window_width, self.window_height)
+        self.caption = "Create custom process"
+        self.screen = open_display(self.size, self.caption)
 
         self.white = (255, 255, 255)
         self.black = (0, 0, 0)
         self.gray = (200, 200, 200)
         self.green = (0, 255, 0)
 
-        self.font = pygame.font.Font(None, 20)
-        self.title_font = pygame.font.Font(None, 30)
+        self.font = get_font(None, 20)
+        self.title_font = get_font(None, 30)
 
         self.cell_width = 120
         self.cell_height = 30
@@ -585,6 +728,7 @@ class ProcessCreator:
 
         self.input_text = ["", "", "", "", ""]
         self.active_input = -1
+        self.manager = None
 
     def draw_table(self):
         """
@@ -593,7 +737,7 @@ class ProcessCreator:
         pygame.draw.rect(self.screen, self.black, (self.table_x, self.table_y, self.table_width, self.table_height), 2)
 
         for i, header in enumerate(self.column_headers):
-            text = self.font.render(header, True, self.black)
+            text = render_text(self.font, header, self.black)
             text_rect = text.get_rect(center=(self.table_x + i * self.cell_width + self.cell_width // 2, self.table_y + self.cell_height // 2))
             self.screen.blit(text, text_rect)
             pygame.draw.line(self.screen, self.black, (self.table_x + i * self.cell_width, self.table_y), (self.table_x + i * self.cell_width, self.table_y + self.table_height), 1)
@@ -603,7 +747,7 @@ class ProcessCreator:
         # Dessine les données des processus
         for i, row in enumerate(self.process_data):
             for j, cell_data in enumerate(row.values()):
-                text = self.font.render(str(cell_data), True, self.black)
+                text = render_text(self.font, str(cell_data), self.black)
                 text_rect = text.get_rect(center=(self.table_x + j * self.cell_width + self.cell_width // 2, self.table_y + (i + 1) * self.cell_height + self.cell_height // 2))
                 self.screen.blit(text, text_rect)
 
@@ -616,7 +760,7 @@ class ProcessCreator:
                 pygame.draw.rect(self.screen, self.green, rect, 2)
             else:
                 pygame.draw.rect(self.screen, self.black, rect, 2)
-            text = self.font.render(self.input_text[i], True, self.black)
+            text = render_text(self.font, self.input_text[i], self.black)
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
 
@@ -625,12 +769,12 @@ class ProcessCreator:
         Dessine les boutons.
         """
         pygame.draw.rect(self.screen, self.gray, self.button_rect)
-        text = self.font.render("Add Process", True, self.black)
+        text = render_text(self.font, "Add Process", self.black)
         text_rect = text.get_rect(center=self.button_rect.center)
         self.screen.blit(text, text_rect)
 
         pygame.draw.rect(self.screen, self.gray, self.validate_button_rect)
-        validate_text = self.font.render("Validate", True, self.black)
+        validate_text = render_text(self.font, "Validate", self.black)
         validate_text_rect = validate_text.get_rect(center=self.validate_button_rect.center)
         self.screen.blit(validate_text, validate_text_rect)
 
@@ -665,60 +809,70 @@ class ProcessCreator:
         for row in self.process_data:
             print(f"Name: {row['name']}, Arrival Time: {row['arrival_time']}, Burst Time: {row['burst_time']}, Period: {row['period']}, Deadline: {row['deadline']}")
 
+    def draw(self):
+        """
+        Dessine toute la fenêtre.
+        """
+        self.screen.fill(self.white)
+        self.draw_table()
+        self.draw_input_boxes()
+        self.draw_buttons()
+
+    def handle_event(self, event):
+        """
+        Gère les clics sur les zones de saisie et les boutons, et la saisie au clavier.
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            for i, rect in enumerate(self.input_rects):
+                if rect.collidepoint(event.pos):
+                    self.active_input = i
+                    break
+            else:
+                self.active_input = -1
+            if self.button_rect.collidepoint(event.pos):
+                self.add_process()
+            elif self.validate_button_rect.collidepoint(event.pos):
+                self.validate_processes()
+                wd.process_windows_with_custom(self.process_data)
+        elif event.type == pygame.KEYDOWN:
+            if self.active_input == -1 and event.key == pygame.K_ESCAPE:
+                self.manager.pop()
+            elif self.active_input != -1:
+                if event.key == pygame.K_RETURN:
+                    self.active_input = -1
+                elif event.key == pygame.K_BACKSPACE:
+                    self.input_text[self.active_input] = self.input_text[self.active_input][:-1]
+                else:
+                    self.input_text[self.active_input] += event.unicode
+
     def run(self):
         """
-        Exécute la boucle principale du jeu.
+        Affiche la fenêtre jusqu'à sa fermeture : elle n'est redessinée qu'après un évènement.
         """
-        running = True
-        while running:
-            self.screen.fill(self.white)
-            self.draw_table()
-            self.draw_input_boxes()
-            self.draw_buttons()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    for i, rect in enumerate(self.input_rects):
-                        if rect.collidepoint(event.pos):
-                            self.active_input = i
-                            break
-                    else:
-                        self.active_input = -1
-                    if self.button_rect.collidepoint(event.pos):
-                        self.add_process()
-                    elif self.validate_button_rect.collidepoint(event.pos):
-                        self.validate_processes()
-                        wd.process_windows_with_custom(self.process_data)
-                elif event.type == pygame.KEYDOWN:
-                    if self.active_input != -1:
-                        if event.key == pygame.K_RETURN:
-                            self.active_input = -1
-                        elif event.key == pygame.K_BACKSPACE:
-                            self.input_text[self.active_input] = self.input_text[self.active_input][:-1]
-                        else:
-                            self.input_text[self.active_input] += event.unicode
-            pygame.display.flip()
-        pygame.quit()
+        wd.manager.run(self)
 
 class ProcessClass:
+    # scène de window.manager : initialisation est appelée quand elle est affichée (enter), exit libère les résultats
     def __init__(self):
         self.rr = None
-        pygame.init()
-        pygame.font.init()
         self.custom = False
         self.difficulty = 1
         self.data = None
         self.width, self.height = (1000, 400)
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        self.font = pygame.font.SysFont("Arial", 20)
+        self.size = (self.width, self.height)
+        self.caption = "Master of scheduling"
+        self.screen = open_display(self.size, self.caption)
+        self.font = get_font("Arial", 20)
         self.bouton_selectionne = None
         self.activated_boutons = []
         self.launch = False
         self.lr = []
         self.lrq = []
         self.tableau = None
+        self.simulations = [] # (algorithm, cache key or None if cached, future) of the simulations running in the background
+        self.verdicts = {}    # {algorithm: schedulability.Verdict or None} of the last launch, shown in the results table
+        self.results_arrived = False    # the next frame draws the whole window, see poll_simulations
+        self.manager = None
 
     def initialisation(self):
         print(self.custom)
@@ -741,10 +895,10 @@ class ProcessClass:
             edf.action = lambda : self.selectionner_bouton(edf)
             fcfs.action = lambda : self.selectionner_bouton(fcfs)
             sjn.action = lambda : self.selectionner_bouton(sjn)
-            result, time_t, performances, readyList = pro.fcfs_scheduling(t1.get_thread())
-            L1 = outList(result, 500, performances, 0, self.screen.get_height() - self.screen.get_height() / 5, 30, (0, 0, 0))
+            result, time_t, performances, readyList = default_cache.run(pro.fcfs_scheduling, t1.get_tasks())
+            L1 = GanttChart(result, 500, 0, self.screen.get_height() - self.screen.get_height() / 5,
+                            max_width=self.screen.get_width() - 215)
             L2 = outList(readyList, 500, performances, 100, self.screen.get_height() - self.screen.get_height() / 1.8, 30, (0, 0, 0))
-            L1.transform_list()
             L2.convert_list()
             B1 = Button(self.screen.get_width() - 105, self.screen.get_height() - 55, 100, 50, (68, 114, 196, 255), (207, 213, 234, 255),
                         "Launch", self.font, (0, 0, 0), (255, 255, 255), lambda: self.launch_process())
@@ -772,12 +926,11 @@ class ProcessClass:
             edf.action = lambda: self.selectionner_bouton(edf)
             fcfs.action = lambda: self.selectionner_bouton(fcfs)
             sjn.action = lambda: self.selectionner_bouton(sjn)
-            result, time_t, performances, readyList = pro.fcfs_scheduling(t1.get_thread())
-            L1 = outList(result, 500, performances, 0, self.screen.get_height() - self.screen.get_height() / 5, 30,
-                         (0, 0, 0))
+            result, time_t, performances, readyList = default_cache.run(pro.fcfs_scheduling, t1.get_tasks())
+            L1 = GanttChart(result, 500, 0, self.screen.get_height() - self.screen.get_height() / 5,
+                            max_width=self.screen.get_width() - 215)
             L2 = outList(readyList, 500, performances, 100, self.screen.get_height() - self.screen.get_height() / 1.8,
                          30, (0, 0, 0))
-            L1.transform_list()
             L2.convert_list()
             B1 = Button(self.screen.get_width() - 105, self.screen.get_height() - 55, 100, 50, (68, 114, 196, 255),
                         (207, 213, 234, 255),
@@ -850,20 +1003,47 @@ class ProcessClass:
         print(f"Bouton sélectionné : {self.bouton_selectionne.name}")
 
     def launch_process(self):
-        self.launch = True
-        results, data = [], []
+        # the selected algorithms run in parallel in worker processes, poll_simulations collects them
+        if self.simulations:
+            print("Simulation already running")
+            return
+        thread_list = self.t1.get_tasks()           # the same task set for every algorithm
+        self.verdicts = {}
         for algo in self.activated_boutons:
-            thread_list = self.t1.get_thread()
-            if algo == "RM":
-                result, time_interval, performances, ready_list = pro.rm_scheduling(thread_list)
-            elif algo == "RR":
-                result, time_interval, performances, ready_list = pro.rr_scheduling(thread_list)
-            elif algo == "EDF":
-                result, time_interval, performances, ready_list = pro.edf_scheduling(thread_list)
-            elif algo == "FCFS":
-                result, time_interval, performances, ready_list = pro.fcfs_scheduling(thread_list)
-            elif algo == "SJN":
-                result, time_interval, performances, ready_list = pro.sjn_scheduling(thread_list)
+            self.verdicts[algo] = schedulability.check(algo, thread_list)
+            key = default_cache.key(ALGORITHMS[algo], thread_list)
+            result = default_cache.get(key)
+            if result is None:
+                future = submit_simulation(algo, pro.reschedule_kept, ALGORITHMS[algo], thread_list)
+            else:                               # same task set already simulated, no need for a worker
+                future = Future()
+                future.set_result(result)
+                key = None
+            self.simulations.append((algo, key, future))
+        self.activated_boutons = []
+        self.bouton_selectionne = None
+        for bouton in self.boutons:
+            bouton.activate()
+
+    def poll_simulations(self):
+        # called by animating before every frame, so the frame that shows the results is never clipped (dirty_rects)
+        if not self.simulations or not all(future.done() for _, _, future in self.simulations):
+            return
+        results, data = [], []
+        tasks = self.t1.get_tasks()
+        for algo, key, future in self.simulations:
+            try:
+                schedule = future.result()
+            except BrokenProcessPool as e:
+                shutdown_simulations([algo])       # its worker died, the next launch gets a new one
+                print(f"Erreur lors de la simulation {algo} : {e}")
+                continue
+            except Exception as e:
+                print(f"Erreur lors de la simulation {algo} : {e}")
+                continue
+            if key is not None:
+                default_cache.put(key, schedule)
+            result, time_interval, performances, ready_list = schedule
 
             results.append({
                 'algorithm': algo,
@@ -873,30 +1053,43 @@ class ProcessClass:
                 'ready_list': ready_list
             })
 
+            metrics = schedule_metrics(schedule, tasks)    # une seule passe sur la trace
             data.append({
-                'Algorithm': algo,
-                'Time interval': time_interval,
-                'Performances': performances
+                'Algo': algo,
+                'Time': time_interval,
+                'Perf': round(performances, 1),
+                'Wait': round(metrics.waiting_time, 1),
+                'Resp': round(metrics.response_time, 1),
+                'CPU %': round(100 * metrics.utilization),
+                'Miss': metrics.deadline_misses,
+                'Switch': metrics.context_switches,
+                'Preempt': metrics.preemptions,
+                'Sched': VERDICT_LABELS.get(getattr(self.verdicts.get(algo), 'verdict', None), "-")
             })
 
-            print(data)
-
-        self.tableau = TableauAffichage(self.screen, self.screen.get_width()/2 - 100, 0, ["Algorithm","Time interval","Performances"], data)
-        self.activated_boutons = []
-        self.bouton_selectionne = None
-        for bouton in self.boutons:
-            bouton.activate()
-        print(results)
+        default_cache.flush()
+        self.simulations = []
+        self.launch = True
+        self.results_arrived = True
+        # entre le tableau des processus et le panneau des algorithmes, en plus petit si les valeurs sont trop larges
+        left = self.t1.x + self.t1.get_width() + 5
+        right = self.screen.get_width() - 215
+        for font_size in (16, 14, 12, 10):
+            self.tableau = TableauAffichage(self.screen, 0, 0,
+                                            ["Algo", "Time", "Perf", "Wait", "Resp", "CPU %", "Miss", "Switch",
+                                             "Preempt", "Sched"],
+                                            data, font_size=font_size)
+            if sum(self.tableau.column_widths) <= right - left:
+                break
+        self.tableau.x = max(left, min(self.screen.get_width()/2 - 100, right - sum(self.tableau.column_widths)))
         self.lr, self.lrq = self.create_list_process(results)
-        print(self.lr)
-        print(self.lrq)
 
     def create_list_process(self, results):
         list_ready_queue, list_result = [], []
         offset = 0
         for result in results:
-            l_result = outList(result['result'], 500, result['performances'], 0, self.screen.get_height() - self.screen.get_height() / 5 - offset, 30, (0, 0, 0))
-            l_result.transform_list()
+            l_result = GanttChart(result['result'], 500, 0, self.screen.get_height() - self.screen.get_height() / 5 - offset,
+                                  max_width=self.screen.get_width() - 215)
             list_result.append(l_result)
             l_rq = outList(result['ready_list'], 500, result['performances'], 100, self.screen.get_height() - self.screen.get_height() / 1.8 - offset, 30, (0, 0, 0))
             l_rq.convert_list()
@@ -904,44 +1097,77 @@ class ProcessClass:
             offset += 20
         return list_result, list_ready_queue
 
+    def draw_progress(self):
+        # progress bar of the simulations running in the background
+        done = sum(1 for _, _, future in self.simulations if future.done())
+        total = len(self.simulations)
+        x, y, width, height = self.screen.get_width() / 2 - 100, 10, 200, 20
+        pygame.draw.rect(self.screen, (207, 213, 234, 255), (x, y, width, height))
+        pygame.draw.rect(self.screen, (68, 114, 196, 255), (x, y, width * done / total, height))
+        dots = "." * (int(time.time() * 3) % 4)
+        text = Text(x, y + height + 5, f"Simulating {done}/{total}{dots}", self.font, (0, 0, 0))
+        text.draw(self.screen)
+
     def display_dict(self, liste):
         for item in liste:
             item.draw_dict(self.screen)
 
     def display_list(self, liste):
         for item in liste:
-            item.draw_order(self.screen)
+            item.draw(self.screen)
 
     def display_with_delay(self):
         if self.lr and self.lrq:
             current_time = 0
             for l_result, l_queue in zip(self.lr, self.lrq):
                 l_queue.current_time = current_time
-                l_result.draw_order(self.screen)
+                l_result.draw(self.screen)
                 l_queue.draw_dict(self.screen)
 
-    def run(self):
-        running = True
+    def draw(self):
+        self.screen.fill((255, 255, 255))
+        self.t1.draw(self.screen)
+        self.cpu.draw(self.screen)
+        self.r1.draw(self.screen)
+        self.draw_algo()
+        self.B1.draw(self.screen)
+        self.B2.draw(self.screen)
+        if self.simulations:
+            self.draw_progress()
+        elif self.launch:
+            self.display_with_delay()
+            if self.tableau:
+                self.tableau.draw()
+
+    def animating(self):
+        # the progress bar while simulating, then the Gantt charts and ready queues until they are fully shown
+        self.poll_simulations()
+        if self.simulations:
+            return True
+        return self.launch and not all(item.finished() for item in self.lr + self.lrq)
+
+    def dirty_rects(self):
+        if self.results_arrived:
+            self.results_arrived = False
+            return None                         # the results are shown everywhere
+        if self.simulations:
+            return [pygame.Rect(self.screen.get_width() / 2 - 100, 10, 220, 50)]   # progress bar and its text
+        return [item.get_rect() for item in self.lr + self.lrq]
+
+    def handle_event(self, event):
+        self.handle(event)
+
+    def enter(self):
         self.initialisation()
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                self.handle(event)
-
-            self.screen.fill((255, 255, 255))
-            self.t1.draw(self.screen)
-            self.cpu.draw(self.screen)
-            self.r1.draw(self.screen)
-            self.draw_algo()
-            self.B1.draw(self.screen)
-            self.B2.draw(self.screen)
-            if self.launch:
-                self.display_with_delay()
-                if self.tableau:
-                    self.tableau.draw()
-            pygame.display.flip()
-        pygame.quit()
+
+    def exit(self):
+        # the charts and the results are dropped with the scene, the simulations still running are cancelled
+        cancel_simulations([(algo, future) for algo, _, future in self.simulations])
+        self.lr, self.lrq, self.tableau, self.simulations = [], [], None, []
+        self.launch = self.results_arrived = False
+
+    def run(self):
+        wd.manager.run(self)
 
 class Help:
     """
@@ -965,7 +1191,8 @@ class Help:
 
     Methods:
         run():
-            Initializes and runs the Pygame event loop for the help window.
+            Shows the help window in window.manager (a scene, see scene_manager.SceneManager) until it is closed.
+            The text is only drawn again after an event, Escape goes back to the previous screen.
 
         handle_event(event):
             Handles Pygame events, specifically mouse events for scrolling and dragging the scrollbar.
@@ -980,14 +1207,14 @@ class Help:
             Draws the help window, text, and scrollbar on its own Pygame surface.
     """
     def __init__(self, width=600, height=400, font=None, text=""):
-        pygame.init()
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption("Help")
+        self.size = (self.width, self.height)
+        self.caption = "Help"
+        self.screen = open_display(self.size, self.caption)
         self.rect = self.screen.get_rect()
         if font is None:
-            self.font = pygame.font.Font(None, 30)
+            self.font = get_font(None, 30)
         else:
             self.font = font
         self.text = text.split('\n')
@@ -1000,21 +1227,15 @@ class Help:
         self.scrollbar_width = 15
         self.mouse_y_start = 0
         self.scroll_y_start = 0
-        self.running = False
+        self.manager = None
 
     def run(self):
-        self.running = True
-        while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                self.handle_event(event)
-            self.draw()
-            pygame.display.flip()
-        pygame.quit()
+        wd.manager.run(self)
 
     def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.manager.pop()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
             if self.get_scrollbar_rect().collidepoint(event.pos):
                 self.dragging = True
                 self.mouse_y_start = event.pos[1]
@@ -1055,18 +1276,15 @@ class Help:
         start = self.scroll_y
         end = min(len(self.text), start + self.visible_lines)
         for i, line in enumerate(self.text[start:end]):
-            text_surface = self.font.render(line, True, self.text_color)
+            text_surface = render_text(self.font, line, self.text_color)
             self.screen.blit(text_surface, (self.rect.x + 5, self.rect.y + i * self.line_height))
         # Draw scrollbar
         pygame.draw.rect(self.screen, (200,200,200), (self.rect.right - self.scrollbar_width, self.rect.y, self.scrollbar_width, self.rect.height))
         pygame.draw.rect(self.screen, (120,120,120), self.get_scrollbar_rect())
 
 class SchedulingMaster:
+    # menu of the game, the first scene of window.manager : the game, the help and the custom processes are pushed above it
     def __init__(self):
-        pygame.init()
-
-        # --- Path to images ---
-        self.ASSETS_PATH = os.path.join(os.path.dirname(__file__), "element")
 
         # --- Colors ---
         self.BACKGROUND_COLOR = (15, 23, 42)
@@ -1079,40 +1297,30 @@ class SchedulingMaster:
 
         # --- Window ---
         self.WIDTH, self.HEIGHT = 1000, 650
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-        pygame.display.set_caption("Master of scheduling")
+        self.size = (self.WIDTH, self.HEIGHT)
+        self.caption = "Master of scheduling"
+        self.screen = open_display(self.size, self.caption)
 
         # --- Font ---
-        self.title_font = pygame.font.SysFont("Segoe UI", 56, bold=True)
-        self.button_font = pygame.font.SysFont("Segoe UI", 28)
-        self.info_font = pygame.font.SysFont("Segoe UI", 20)
-        self.help_font = pygame.font.SysFont("Segoe UI", 18)
+        self.title_font = get_font("Segoe UI", 56, bold=True)
+        self.button_font = get_font("Segoe UI", 28)
+        self.info_font = get_font("Segoe UI", 20)
+        self.help_font = get_font("Segoe UI", 18)
 
         # --- Load images ---
-        self.robot_img = pygame.image.load(os.path.join(self.ASSETS_PATH, "robot.png"))
-        self.robot_img = pygame.transform.scale(self.robot_img, (150, 150))
-
-        self.play_icon = pygame.image.load(os.path.join(self.ASSETS_PATH, "play_icon.png"))
-        self.play_icon = pygame.transform.scale(self.play_icon, (28, 28))
-
-        self.help_icon = pygame.image.load(os.path.join(self.ASSETS_PATH, "help_icon.png"))
-        self.help_icon = pygame.transform.scale(self.help_icon, (28, 28))
-
-        self.settings_icon = pygame.image.load(os.path.join(self.ASSETS_PATH, "settings_icon.png"))
-        self.settings_icon = pygame.transform.scale(self.settings_icon, (28, 28))
-
-        self.quit_icon = pygame.image.load(os.path.join(self.ASSETS_PATH, "quit_icon.png"))
-        self.quit_icon = pygame.transform.scale(self.quit_icon, (28, 28))
+        self.robot_img = load_image("element/robot.png", (150, 150))
+        self.play_icon = load_image("element/play_icon.png", (28, 28))
+        self.help_icon = load_image("element/help_icon.png", (28, 28))
+        self.settings_icon = load_image("element/settings_icon.png", (28, 28))
+        self.quit_icon = load_image("element/quit_icon.png", (28, 28))
 
         # State variables
-        self.clock = pygame.time.Clock()
-        self.running = True
+        self.manager = None
         self.show_difficulty = False
-        self.show_help_menu = False
-        self.show_game = False
         self.show_info_menu = False
         self.show_algo_detail = False
         self.selected_algorithm = None
+        self.wrapped_texts = {}     # (text, font, max_width) -> lines, see wrap_text
 
         # Description of algorithms
         self.algorithm_descriptions = {
@@ -1129,7 +1337,7 @@ class SchedulingMaster:
         pygame.draw.rect(self.screen, color, button_rect, border_radius=12)
         if icon:
             self.screen.blit(icon, (x + 10, y + (h - icon.get_height()) // 2))
-        text_surf = self.button_font.render(text, True, self.TEXT_COLOR)
+        text_surf = render_text(self.button_font, text, self.TEXT_COLOR)
         if icon:
             text_rect = text_surf.get_rect(midleft=(x + 55, y + h // 2))
         else:
@@ -1139,10 +1347,10 @@ class SchedulingMaster:
 
     def draw_difficulty_selection(self):
         self.screen.fill(self.BACKGROUND_COLOR)
-        title_surf = self.title_font.render("Choose the difficulty", True, self.TEXT_COLOR)
+        title_surf = render_text(self.title_font, "Choose the difficulty", self.TEXT_COLOR)
         self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH // 2, 100)))
-        subtitle_font = pygame.font.SysFont("Segoe UI", 24, italic=True)
-        subtitle_surf = subtitle_font.render("Ready for the challenge? Select your level!", True, self.TEXT_COLOR)
+        subtitle_font = get_font("Segoe UI", 24, italic=True)
+        subtitle_surf = render_text(subtitle_font, "Ready for the challenge? Select your level!", self.TEXT_COLOR)
         subtitle_rect = subtitle_surf.get_rect(center=(self.WIDTH // 2, 150))
         self.screen.blit(subtitle_surf, subtitle_rect)
 
@@ -1154,7 +1362,7 @@ class SchedulingMaster:
             btn = pygame.Rect(self.WIDTH // 2 - 130, start_y + i * 90, 260, 60)
             color = self.BUTTON_HOVER_COLOR if btn.collidepoint(mouse_pos) else self.BUTTON_COLOR
             pygame.draw.rect(self.screen, color, btn, border_radius=10)
-            text_surf = self.button_font.render(level, True, self.TEXT_COLOR)
+            text_surf = render_text(self.button_font, level, self.TEXT_COLOR)
             text_rect = text_surf.get_rect(center=btn.center)
             self.screen.blit(text_surf, text_rect)
             buttons.append((btn, level))
@@ -1162,7 +1370,7 @@ class SchedulingMaster:
 
     def draw_info_menu(self):
         self.screen.fill(self.BACKGROUND_COLOR)
-        title_surf = self.title_font.render("Scheduling Algorithms", True, self.TEXT_COLOR)
+        title_surf = render_text(self.title_font, "Scheduling Algorithms", self.TEXT_COLOR)
         self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH // 2, 60)))
         mouse_pos = pygame.mouse.get_pos()
         buttons = []
@@ -1182,7 +1390,7 @@ class SchedulingMaster:
             "Dynamic? → EDF"
         ]
         for i, line in enumerate(help_text):
-            txt = self.help_font.render(line, True, self.TEXT_COLOR)
+            txt = render_text(self.help_font, line, self.TEXT_COLOR)
             self.screen.blit(txt, (120, 465 + i * 22))
 
         # Back button
@@ -1190,6 +1398,12 @@ class SchedulingMaster:
         return buttons, back_btn
 
     def wrap_text(self, text, font, max_width):
+        key = (text, font, max_width)
+        if key not in self.wrapped_texts:   # the descriptions don't change, they are only wrapped once
+            self.wrapped_texts[key] = self._wrap_text(text, font, max_width)
+        return self.wrapped_texts[key]
+
+    def _wrap_text(self, text, font, max_width):
         words = text.split(' ')
         lines = []
         current_line = ''
@@ -1205,7 +1419,7 @@ class SchedulingMaster:
 
     def draw_algo_detail(self, algo_name):
         self.screen.fill(self.INFO_BG_COLOR)
-        title_surf = self.title_font.render(algo_name + " Algorithm", True, self.TEXT_COLOR)
+        title_surf = render_text(self.title_font, algo_name + " Algorithm", self.TEXT_COLOR)
         self.screen.blit(title_surf, title_surf.get_rect(topleft=(40, 30)))
 
         pygame.draw.rect(self.screen, self.BACKGROUND_COLOR, (40, 120, 920, 480), border_radius=12)
@@ -1213,99 +1427,76 @@ class SchedulingMaster:
         wrapped_text = self.wrap_text(description, self.info_font, 880)
 
         for i, line in enumerate(wrapped_text):
-            text_surf = self.info_font.render(line, True, self.TEXT_COLOR)
+            text_surf = render_text(self.info_font, line, self.TEXT_COLOR)
             self.screen.blit(text_surf, (60, 140 + i * 28))
 
         mouse_pos = pygame.mouse.get_pos()
         return self.draw_button("Back", None, 40, self.HEIGHT - 60, 100, 40, mouse_pos)
 
-    def run(self):
-        while self.running:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.show_algo_detail:
-                        back_btn = self.draw_algo_detail(self.selected_algorithm)
-                        if back_btn.collidepoint(event.pos):
-                            self.show_algo_detail = False
-                            self.show_info_menu = True
-                    elif self.show_info_menu:
-                        algo_buttons, back_btn = self.draw_info_menu()
-                        for btn, name in algo_buttons:
-                            if btn.collidepoint(event.pos):
-                                self.selected_algorithm = name
-                                self.show_info_menu = False
-                                self.show_algo_detail = True
-                        if back_btn.collidepoint(event.pos):
-                            self.show_info_menu = False
-                    elif self.show_difficulty:
-                        difficulty_buttons = self.draw_difficulty_selection()
-                        for btn, level in difficulty_buttons:
-                            if btn.collidepoint(event.pos):
-                                print(f"Difficulty chosen: {level}")
-                                if level == "Beginner":
-                                    wd.process_window_with_difficulty(1)
-                                    self.show_difficulty = False
-                                    self.show_game = True
-                                elif level == "Easy":
-                                    wd.process_window_with_difficulty(2)
-                                    self.show_difficulty = False
-                                    self.show_game = True
-                                elif level == "Intermediate":
-                                    wd.process_window_with_difficulty(3)
-                                    self.show_difficulty = False
-                                    self.show_game = True
-                                elif level == "Difficult":
-                                    wd.process_window_with_difficulty(4)
-                                    self.show_difficulty = False
-                                    self.show_game = True
-                                elif level == "Custom":
-                                    wd.custom_process_window()
-                                    self.show_difficulty = False
-                                    self.show_game = True
-                    else:
-                        if not self.show_game:
-                            play_button = self.draw_button("Play", self.play_icon, 370, 320, 260, 60, mouse_pos)
-                            algo_button = self.draw_button("Informations about all algorithms", self.settings_icon, 270, 410, 460, 60, mouse_pos)
-                            help_button = self.draw_button("Help",self.help_icon,370,500,260,60,mouse_pos)
-                            quit_button = self.draw_button("Exit", self.quit_icon, 370, 590, 260, 60, mouse_pos)
-
-                            if play_button.collidepoint(event.pos):
-                                self.show_difficulty = True
-                            elif algo_button.collidepoint(event.pos):
-                                self.show_info_menu = True
-                            elif help_button.collidepoint(event.pos):
-                                self.show_help_menu = True
-                            elif quit_button.collidepoint(event.pos):
-                                self.running = False
-
+    def handle_event(self, event):
+        mouse_pos = pygame.mouse.get_pos()
+        if event.type == pygame.MOUSEBUTTONDOWN:
             if self.show_algo_detail:
-                self.draw_algo_detail(self.selected_algorithm)
+                back_btn = self.draw_algo_detail(self.selected_algorithm)
+                if back_btn.collidepoint(event.pos):
+                    self.show_algo_detail = False
+                    self.show_info_menu = True
             elif self.show_info_menu:
                 algo_buttons, back_btn = self.draw_info_menu()
-            elif self.show_help_menu:
-                wd.help_window()
-                self.show_help_menu = False
-            elif self.show_game:
-                self.screen.fill(self.GRAY_BACKGROUND)
+                for btn, name in algo_buttons:
+                    if btn.collidepoint(event.pos):
+                        self.selected_algorithm = name
+                        self.show_info_menu = False
+                        self.show_algo_detail = True
+                if back_btn.collidepoint(event.pos):
+                    self.show_info_menu = False
             elif self.show_difficulty:
                 difficulty_buttons = self.draw_difficulty_selection()
+                levels = {"Beginner": 1, "Easy": 2, "Intermediate": 3, "Difficult": 4}
+                for btn, level in difficulty_buttons:
+                    if btn.collidepoint(event.pos):
+                        print(f"Difficulty chosen: {level}")
+                        # the game is shown above the menu, which is back on its first page when the game is left
+                        if level in levels:
+                            self.show_difficulty = False
+                            wd.process_window_with_difficulty(levels[level])
+                        elif level == "Custom":
+                            self.show_difficulty = False
+                            wd.custom_process_window()
             else:
-                self.screen.fill(self.BACKGROUND_COLOR)
-                title_surf = self.title_font.render("Maître de l'Ordonnancement", True, self.TEXT_COLOR)
-                title_rect = title_surf.get_rect(center=(self.WIDTH // 2, 80))
-                self.screen.blit(title_surf, title_rect)
-                self.screen.blit(self.robot_img, (self.WIDTH // 2 - self.robot_img.get_width() // 2, 150))
                 play_button = self.draw_button("Play", self.play_icon, 370, 320, 260, 60, mouse_pos)
                 algo_button = self.draw_button("Informations about all algorithms", self.settings_icon, 270, 410, 460, 60, mouse_pos)
                 help_button = self.draw_button("Help",self.help_icon,370,500,260,60,mouse_pos)
                 quit_button = self.draw_button("Exit", self.quit_icon, 370, 590, 260, 60, mouse_pos)
 
-            pygame.display.flip()
-            self.clock.tick(60)
+                if play_button.collidepoint(event.pos):
+                    self.show_difficulty = True
+                elif algo_button.collidepoint(event.pos):
+                    self.show_info_menu = True
+                elif help_button.collidepoint(event.pos):
+                    wd.help_window()
+                elif quit_button.collidepoint(event.pos):
+                    self.manager.stop()
+
+    def draw(self):
+        mouse_pos = pygame.mouse.get_pos()
+        if self.show_algo_detail:
+            self.draw_algo_detail(self.selected_algorithm)
+        elif self.show_info_menu:
+            self.draw_info_menu()
+        elif self.show_difficulty:
+            self.draw_difficulty_selection()
+        else:
+            self.screen.fill(self.BACKGROUND_COLOR)
+            title_surf = render_text(self.title_font, "Maître de l'Ordonnancement", self.TEXT_COLOR)
+            title_rect = title_surf.get_rect(center=(self.WIDTH // 2, 80))
+            self.screen.blit(title_surf, title_rect)
+            self.screen.blit(self.robot_img, (self.WIDTH // 2 - self.robot_img.get_width() // 2, 150))
+            self.draw_button("Play", self.play_icon, 370, 320, 260, 60, mouse_pos)
+            self.draw_button("Informations about all algorithms", self.settings_icon, 270, 410, 460, 60, mouse_pos)
+            self.draw_button("Help",self.help_icon,370,500,260,60,mouse_pos)
+            self.draw_button("Exit", self.quit_icon, 370, 590, 260, 60, mouse_pos)
 
-        pygame.quit()
-        sys.exit()
\ No newline at end of file
+    def run(self):
+        # until the window is closed or Exit is clicked, every other screen is shown above the menu
+        wd.manager.run(self)
\ No newline at end of file
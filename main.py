@@ -1,4 +1,6 @@
+from assets import default_assets
 import window as wd
 
 if __name__ == "__main__":
+    default_assets.preload()    # the images are decoded in the background while the menu opens
     wd.main_window()
\ No newline at end of file
@@ -1,5 +1,22 @@
+import copy
+import heapq
+import math
+from collections import namedtuple
+from time import perf_counter
 import numpy as np
+from schedule_stats import EngineStats, ADMISSION, DISPATCH_PHASE, COMPLETION, ADVANCE
+from schedule_trace import Event, EventBuffer, Trace, RUN, ARRIVE, REQUEUE, DISPATCH, PREEMPT, DROP
+
+VECTORIZED_THRESHOLD = 10000 # from this number of processes, FCFS and SJN are evaluated with NumPy
+ENGINE_VERSION = 2            # to increase when a change of the schedulers changes their output, stored schedules are then ignored
+CHECKPOINT_EVERY = 256        # trace rows between two checkpoints saved by reschedule
+
 class Process:
+    # fixed attributes instead of a __dict__ : RM and EDF create one for every job they release
+    __slots__ = ("pid", "arrival_time", "burst_time", "remaining_time", "waiting_time", "turnaround_time",
+                 "period", "deadline",
+                 "arrival") # set by rr_scheduling when the process goes back to the ready queue
+
     def __init__(self, pid, arrival_time, burst_time, period=None, deadline=None):
         self.pid = pid                      # id of the process
         self.arrival_time = abs(arrival_time)    # time of the arrival
@@ -18,117 +35,648 @@ class Process:
         else:
             self.deadline = deadline
 
-def fcfs_scheduling(processes):
-    processes.sort(key=lambda x: x.arrival_time)
-    ready_queue = [] # list : [pid, enter_time , -10(null value)] & [pid, -10(null value), leave_time]
-    ready_list = [] # list that contains [pid, start_time, end_time]
+    @classmethod
+    def record(cls, pid, arrival_time, burst_time, period, deadline, remaining_time=None):
+        # process built from values already checked by __init__ or TaskSet, without checking them again
+        self = cls.__new__(cls)
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time if remaining_time is None else remaining_time
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.period = period
+        self.deadline = deadline
+        return self
+
+class Task(namedtuple("Task", ["pid", "arrival_time", "burst_time", "period", "deadline"])):
+    """
+    Immutable description of a task. The schedulers never change what they are given, so the same tasks
+    can be scheduled by several algorithms, threads or processes at once without being copied.
+    make() checks the values like Process does (absolute times, default period and deadline).
+    """
+    __slots__ = ()
+
+    @classmethod
+    def make(cls, pid, arrival_time, burst_time, period=None, deadline=None):
+        p = Process(pid, arrival_time, burst_time, period, deadline)
+        return cls(p.pid, p.arrival_time, p.burst_time, p.period, p.deadline)
+
+def _column(values):
+    # int64 if every value is an integer, so the times computed from them stay integers, float64 otherwise.
+    # The columns are read-only, a TaskSet can be shared by several runs
+    column = np.array(values)
+    if column.size == 0:
+        column = column.astype(np.int64)
+    elif column.dtype.kind not in "iuf":
+        column = column.astype(np.float64)
+    elif column.dtype.kind == "u":
+        column = column.astype(np.int64)
+    column.flags.writeable = False
+    return column
+
+class TaskSet:
+    """
+    Task set stored as one read-only array per parameter instead of one Process per task.
+    The analyses and the vectorized FCFS / SJN read the columns directly, the event loops make their own records.
+
+    Attributes:
+        pid: List of the ids.
+        arrival_time: Column of the arrival times.
+        burst_time: Column of the execution times.
+        period: Column of the periods.
+        deadline: Column of the relative deadlines.
+        remaining_time: Column of the execution times left.
+
+    Methods:
+        from_processes(processes): Builds a task set from Process or Task objects.
+        from_dicts(tasks): Builds a task set from dicts with name, arrival_time, burst_time, period and deadline keys,
+            checking the values like Process does (absolute times, default period and deadline).
+        processes(): Returns a new list of Process records, one per task.
+        tasks(): Returns the list of Task, one per task.
+    """
+    def __init__(self, pid, arrival_time, burst_time, period, deadline, remaining_time=None):
+        self.pid = list(pid)
+        self.arrival_time = _column(arrival_time)
+        self.burst_time = _column(burst_time)
+        self.period = _column(period)
+        self.deadline = _column(deadline)
+        self.remaining_time = self.burst_time if remaining_time is None else _column(remaining_time)
+
+    @classmethod
+    def from_processes(cls, processes):
+        return cls([p.pid for p in processes], [p.arrival_time for p in processes], [p.burst_time for p in processes],
+                   [p.period for p in processes], [p.deadline for p in processes],
+                   [getattr(p, 'remaining_time', p.burst_time) for p in processes])
+
+    @classmethod
+    def from_dicts(cls, tasks):
+        burst = _column([t['burst_time'] for t in tasks])
+        period = _column([t['period'] or 0 for t in tasks])      # None or 0 : default value
+        deadline = _column([t['deadline'] or 0 for t in tasks])
+        return cls([t['name'] for t in tasks], np.abs(_column([t['arrival_time'] for t in tasks])), np.abs(burst),
+                   np.where(period <= 0, 3 * burst, period), np.where(deadline <= 0, 2 * burst, deadline))
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, i):
+        return Task(self.pid[i], self.arrival_time[i].item(), self.burst_time[i].item(), self.period[i].item(),
+                    self.deadline[i].item())
+
+    def processes(self):
+        return [Process.record(*row) for row in zip(self.pid, self.arrival_time.tolist(), self.burst_time.tolist(),
+                                                   self.period.tolist(), self.deadline.tolist(),
+                                                   self.remaining_time.tolist())]
+
+    def tasks(self):
+        return [Task(*row) for row in zip(self.pid, self.arrival_time.tolist(), self.burst_time.tolist(),
+                                          self.period.tolist(), self.deadline.tolist())]
+
+    def __iter__(self):
+        return iter(self.tasks())
+
+def _records(processes):
+    # state of a run : new Process records the event loop can change, the caller's tasks are left untouched
+    if isinstance(processes, TaskSet):
+        return processes.processes()
+    return [Process.record(p.pid, p.arrival_time, p.burst_time, p.period, p.deadline,
+                           getattr(p, 'remaining_time', None)) for p in processes]
+
+class ScheduleResult(tuple):
+    """
+    What a scheduler returns : (results, time, performances, ready_list), so it can be unpacked as before.
+    results and ready_list are read-only views of the columnar trace, available as the trace attribute.
+    Extra information about the run (deadline_misses, hyperperiod, horizon, ...) is available as attributes.
+    The hyperperiod of RM and EDF is math.inf when it is longer than the horizon they were given.
+    """
+    def __new__(cls, results, time, performances, ready_list, **info):
+        self = super().__new__(cls, (results, time, performances, ready_list))
+        self.__dict__.update(info)
+        return self
+
+    def __reduce__(self):
+        # lets a result computed in a worker process be sent back to the caller
+        return (self.__class__, tuple(self), self.__dict__)
+
+class ReadyQueue:
+    """
+    Ready queue backed by a binary heap: push and pop are O(log n) and the head is read in O(1).
+    Processes with the same priority leave the queue in the order they entered it.
+    Without a priority function the queue is a plain FIFO.
+    """
+    def __init__(self, priority=None):
+        self.priority = priority
+        self.heap = []      # entries : (priority, insertion order, process)
+        self.counter = 0    # insertion order, used to break ties
+
+    def push(self, process):
+        key = 0 if self.priority is None else self.priority(process)
+        heapq.heappush(self.heap, (key, self.counter, process))
+        self.counter += 1
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def head(self):
+        return self.heap[0][2]
+
+    def head_priority(self):
+        return self.heap[0][0]
+
+    def drop_expired(self, time):
+        # with the deadline as priority, the jobs that reached their deadline are at the head of the queue.
+        # Only every other one is erased per call, the one following an erased job stays until the next call
+        expired = []
+        while len(self.heap) > 0 and self.heap[0][2].deadline <= time:
+            expired.append(heapq.heappop(self.heap))
+        for entry in expired[1::2]:
+            heapq.heappush(self.heap, entry)
+        return [entry[2] for entry in expired[0::2]]
+
+    def __len__(self):
+        return len(self.heap)
+
+class CountingReadyQueue(ReadyQueue):
+    """
+    ReadyQueue counting its operations in an EngineStats. Only the instrumented runs use it,
+    so the counters cost nothing to the others.
+    """
+    def __init__(self, priority=None, stats=None):
+        super().__init__(priority)
+        self.stats = stats
+
+    def push(self, process):
+        super().push(process)
+        self.stats.pushes += 1
+        if len(self.heap) > self.stats.peak_queue:
+            self.stats.peak_queue = len(self.heap)
+
+    def pop(self):
+        self.stats.pops += 1
+        return super().pop()
+
+    def drop_expired(self, time):
+        expired = super().drop_expired(time)
+        self.stats.pops += len(expired)
+        return expired
+
+def _ready_queue(priority=None, stats=None):
+    return ReadyQueue(priority) if stats is None else CountingReadyQueue(priority, stats)
+
+class ReleaseCalendar:
+    """
+    Next release time of every periodic task, kept in a min-heap.
+    A task is released at every instant where (instant - arrival_time) % period == 0, starting from 0,
+    or from start to pick up a schedule in the middle.
+    Tasks released at the same instant come out in the order of the list given at creation.
+    """
+    def __init__(self, tasks, start=0):
+        self.tasks = tasks
+        self.heap = [(_first_release(p, start), i) for i, p in enumerate(tasks)] # entries : (release time, task index)
+        heapq.heapify(self.heap)
+
+    def next_time(self):
+        return self.heap[0][0]
+
+    def pop_due(self, time):
+        # tasks released at time, each one is rescheduled one period later
+        due = []
+        while len(self.heap) > 0 and self.heap[0][0] <= time:
+            release, i = self.heap[0]
+            heapq.heapreplace(self.heap, (release + self.tasks[i].period, i))
+            due.append(self.tasks[i])
+        return due
+
+def _first_release(process, start=0):
+    # first instant from start where the task is released
+    release = process.arrival_time % process.period
+    if release < start:
+        release += -((release - start) // process.period) * process.period
+    return release
+
+def hyperperiod(processes, limit=None):
+    # LCM of all periods, computed on Python integers so it can't overflow.
+    # limit : the LCM is folded one period at a time and math.inf is returned as soon as it goes past limit,
+    # an explicit horizon doesn't need the thousands of digits of the LCM of many coprime periods
+    h = 1
+    for p in processes:
+        if p.period:
+            h = math.lcm(h, p.period)
+            if limit is not None and h > limit:
+                return math.inf
+    return h
+
+def _periodic_state(time, process, start_time, ready_queue):
+    # everything that decides how the schedule goes on from time, relative to time
+    def job(p):
+        return (p.pid, p.period, p.deadline, p.remaining_time, time - p.arrival_time)
+    queued = tuple(job(entry[2]) for entry in sorted(ready_queue.heap))
+    if process is None:
+        return (None, queued)
+    return (job(process), time - start_time, queued)
+
+def _ticks(value):
+    # number of one-unit steps needed before value drops to 0 or below
+    if value <= 0:
+        return 0
+    return math.ceil(value)
+
+def _summary(trace, time, performances, stats=None, span=None, **info):
+    # what an engine returns : the ScheduleResult of its trace, or only the totals when its events were streamed.
+    # stats : EngineStats of an instrumented run, completed with the events of the trace up to span (time by default)
+    if stats is not None:
+        span = time if span is None else span
+        if isinstance(trace, EventBuffer):
+            stats.count_events(trace)               # the last events, not read yet
+            stats.stop(span)
+        else:
+            stats.count_trace(trace, span)
+        info['stats'] = stats
+    if isinstance(trace, EventBuffer):
+        return ScheduleResult(None, time, performances, None, **info)
+    return ScheduleResult(trace.results(), time, performances, trace.ready_list(), trace=trace, **info)
+
+def _result(run):
+    # runs an engine to its end and returns its ScheduleResult. Without a stream an engine never yields
+    while True:
+        try:
+            next(run)
+        except StopIteration as stop:
+            return stop.value
+
+# The engines are generators : with a stream (EventBuffer), they record their events in it instead of a Trace
+# and yield each time there are some, so they can be read while the schedule goes on, see stream_schedule.
+# With stats (EngineStats), they count their operations and time the phases of each iteration in it.
+
+def _run_non_preemptive(processes, priority=None, checkpoints=None, checkpoint_every=CHECKPOINT_EVERY, resume=None,
+                        stream=None, stats=None):
+    # checkpoints : list the state is saved to every checkpoint_every trace rows or more, see _run_periodic
+    # resume : (checkpoint, trace of its run) to start from instead of time 0
+    # stream : EventBuffer the events are recorded in instead of a Trace
+    # stats : EngineStats of an instrumented run
+    arrivals = sorted(processes, key=lambda x: x.arrival_time) # the caller's list is left untouched
+    next_arrival = 0 # index in arrivals of the first process that hasn't arrived yet
+    ready_queue = _ready_queue(priority, stats) # processes waiting for the cpu, ordered by priority then arrival
+    trace = Trace() if stream is None else stream # every event of the schedule
     time = 0
-    results = []
-    cpu = []
     total_waiting_time = 0
+    deadline_misses = 0 # processes completed after arrival_time + deadline
     completed = 0
     start_time = 0
+    process = None # process that is currently in the cpu
     n = len(processes)
 
+    next_checkpoint = 0 # trace length from which the next checkpoint is saved
+    checkpoint_time = None # time of the previous loop, a checkpoint is only saved at the first loop of an instant
+    if checkpoints is not None:
+        position = {id(p): i for i, p in enumerate(arrivals)}
+    if resume is not None:
+        checkpoint, previous_trace = resume
+        (time, next_arrival, queued, ready_queue.counter, running, remaining, start_time,
+         total_waiting_time, deadline_misses, completed, rows) = checkpoint
+        ready_queue.heap = [(key, counter, arrivals[i]) for key, counter, i in queued]
+        if running is not None:
+            process = arrivals[running]
+            process.remaining_time = remaining
+        trace = previous_trace.head(rows)
+        next_checkpoint = rows + max(checkpoint_every, len(queued))   # as after the checkpoint in the first run
+
     # while all the process hasn't been processed
     while completed != n:
+        if stream is not None and len(stream) > 0:
+            if stats is not None:
+                stats.count_events(stream)
+            yield
+        if checkpoints is not None:
+            if time != checkpoint_time and len(trace) >= next_checkpoint:
+                checkpoints.append((time, next_arrival,
+                                    [(key, counter, position[id(p)]) for key, counter, p in ready_queue.heap],
+                                    ready_queue.counter,
+                                    None if process is None else position[id(process)],
+                                    None if process is None else process.remaining_time,
+                                    start_time, total_waiting_time, deadline_misses, completed, len(trace)))
+                next_checkpoint = len(trace) + max(checkpoint_every, len(ready_queue))
+            checkpoint_time = time
+        if stats is not None:
+            stats.iterations += 1
+            lap = perf_counter()
+
         # arrived process                   first apparition
-        arrived = [p for p in processes if p.arrival_time <= time]
-    
-        for p in arrived:
-            # print("process :", p.pid, "arrivée à", time)
-            ready_queue.append(p)                               # add it to the ready_queue
-            ready_list.append([p.pid, time, -10])               # mark it as arrived
-            processes.remove(p)                                 # remove the process from the list of processes if it's add to the ready queue
-        
-        # if there is process in the queue or in the cpu
-        if ready_queue != [] or cpu != []:
-            
-            # if there is no process cpu
-            if cpu == []:
-                process = ready_queue.pop(0)                        # take the first process in the ready_queue
-                cpu.append(process.pid)                             # add the process to the cpu
-                ready_list.append([process.pid, -10, time])         # add to read_list the process that is currently processing
-                start_time = time                                   # we reset the start time
-
-            # if the process is finished 
-            if process.remaining_time <= 0: 
-                process.waiting_time = time - process.arrival_time
-                total_waiting_time += process.waiting_time
-                results.append([process.pid, start_time, time]) # we add it to the results
-                cpu.pop()                                       # remove the process from the cpu       
-                start_time = time                               # reset the start time
-                completed += 1                                  # increment the number of completed processes
-            
-            # if the process is not finished
-            else:                           
-                process.remaining_time -= 1                     # decrement the remaining time
-                time += 1                                       # increment the time
-        else:
-            time += 1
+        while next_arrival < n and arrivals[next_arrival].arrival_time <= time:
+            p = arrivals[next_arrival]
+            ready_queue.push(p)                                 # add it to the ready_queue
+            trace.add(ARRIVE, p.pid, time, time)                # mark it as arrived
+            next_arrival += 1                                   # move the cursor past the process
+        if stats is not None:
+            lap = stats.lap(ADMISSION, lap)
+
+        # if there is no process in the cpu
+        if process is None and len(ready_queue) > 0:
+            process = ready_queue.pop()                         # take the first process in the ready_queue
+            trace.add(DISPATCH, process.pid, math.ceil(process.arrival_time), time) # add to read_list the process that is currently processing
+            start_time = time                                   # we reset the start time
+        if stats is not None:
+            lap = stats.lap(DISPATCH_PHASE, lap)
+
+        # if the cpu is idle, jump to the next arrival
+        if process is None:
+            time = math.ceil(arrivals[next_arrival].arrival_time)
+            if stats is not None:
+                stats.lap(ADVANCE, lap)
+            continue
+
+        # if the process is finished
+        if process.remaining_time <= 0:
+            process.waiting_time = time - process.arrival_time
+            total_waiting_time += process.waiting_time
+            if process.waiting_time > process.deadline:
+                deadline_misses += 1
+            trace.add(RUN, process.pid, start_time, time)       # we add it to the results
+            process = None                                      # remove the process from the cpu
+            start_time = time                                   # reset the start time
+            completed += 1                                      # increment the number of completed processes
+            if stats is not None:
+                stats.lap(COMPLETION, lap)
+            continue
+
+        # run the process until it finishes or until the next arrival
+        next_time = time + _ticks(process.remaining_time)
+        if next_arrival < n:
+            next_time = min(next_time, math.ceil(arrivals[next_arrival].arrival_time))
+        process.remaining_time -= next_time - time
+        time = next_time
+        if stats is not None:
+            stats.lap(ADVANCE, lap)
 
     performances = total_waiting_time / n
-    return results, time, performances, ready_list
+    return _summary(trace, time, performances, stats, deadline_misses=deadline_misses)
 
-def sjn_scheduling(processes):
-    processes.sort(key=lambda x: x.arrival_time)
-    ready_queue = [] # list : [pid, enter_time , -10(null value)] & [pid, -10(null value), leave_time]
-    ready_list = [] # list that contains [pid, start_time, end_time]
+def _dispatch_order(admitted, burst, keys):
+    # order in which a non-preemptive scheduler takes the processes, sorted by arrival, out of the ready queue
+    order = []
+    heap = [] # entries : (priority, arrival order)
     time = 0
-    cpu = []
-    results = []
+    i = 0
+    n = len(admitted)
+    while len(order) < n:
+        # if the ready queue is empty, the cpu stays idle until the next arrival
+        if heap == [] and admitted[i] > time:
+            time = admitted[i]
+        while i < n and admitted[i] <= time:
+            heapq.heappush(heap, (keys[i], i))
+            i += 1
+        j = heapq.heappop(heap)[1]
+        order.append(j)
+        time += burst[j]
+    return np.array(order, dtype=np.int64)
+
+def _run_non_preemptive_vectorized(tasks, by=None, stats=None):
+    # same schedule as _run_non_preemptive, computed with a few NumPy operations instead of one loop per event
+    # tasks : TaskSet, by : name of the column SJN takes the shortest first from, None for FCFS
+    # stats : EngineStats of an instrumented run, there is no loop so only the events and the total time are counted
+    sort = np.argsort(tasks.arrival_time, kind="stable") # processes in arrival order, the task set is left untouched
+    n = len(tasks)
+    arrival = tasks.arrival_time[sort]
+    admitted = np.ceil(arrival).astype(np.int64)                            # time each process enters the ready queue
+    burst = np.ceil(np.maximum(tasks.remaining_time[sort], 0)).astype(np.int64) # ticks to run
+    pid_index = {}
+    pid = np.array([pid_index.setdefault(tasks.pid[i], len(pid_index)) for i in sort.tolist()], dtype=np.int64)
+
+    # FCFS takes the processes in arrival order, SJN needs a heap to know the order
+    if by is None:
+        order = np.arange(n)
+    else:
+        order = _dispatch_order(admitted.tolist(), burst.tolist(), getattr(tasks, by)[sort].tolist())
+
+    # end[i] = max(end[i-1], admitted[i]) + burst[i], i.e. cumulative burst plus the running max of the idle gaps
+    b = burst[order]
+    done = np.cumsum(b)
+    end = done + np.maximum.accumulate(admitted[order] - (done - b))
+    start = end - b
+
+    # rows sorted by time : arrivals first, then each dispatch followed by its completion
+    k = np.arange(n)
+    times = np.concatenate((admitted, start, end))
+    rank = np.concatenate((np.zeros(n, dtype=np.int64), np.ones(2 * n, dtype=np.int64)))
+    sub = np.concatenate((k, 2 * k, 2 * k + 1))
+    rows = np.lexsort((sub, rank, times))
+    trace = Trace.from_columns(
+        pid_index,
+        np.concatenate((pid, pid[order], pid[order]))[rows],
+        np.concatenate((np.full(n, ARRIVE), np.full(n, DISPATCH), np.full(n, RUN)))[rows],
+        np.concatenate((admitted, admitted[order], start))[rows],
+        times[rows],
+    )
+
+    waiting = end - arrival[order]
+    total_waiting_time = waiting.sum().item()
+    deadline = tasks.deadline[sort]
+    deadline_misses = int(np.count_nonzero(waiting > deadline[order]))
+    performances = total_waiting_time / n
+    if stats is not None:
+        stats.queue_from_trace(trace)
+    return _summary(trace, int(end[-1]), performances, stats, deadline_misses=deadline_misses)
+
+def _job(pid, arrival_time, burst_time, period, deadline, remaining_time):
+    # job released by a periodic task, rebuilt from a checkpoint
+    return Process.record(pid, arrival_time, burst_time, period, deadline, remaining_time)
+
+def _job_state(p):
+    return (p.pid, p.arrival_time, p.burst_time, p.period, p.deadline, p.remaining_time)
+
+def _steady_from(processes, drop_expired):
+    # time from which the schedule of _run_periodic may be found to repeat itself
+    return max(p.deadline for p in processes) if drop_expired else 0
+
+def _run_periodic(processes, priority, drop_expired=False, horizon=None, checkpoints=None,
+                  checkpoint_every=CHECKPOINT_EVERY, resume=None, stream=None, stats=None):
+    # checkpoints : list the state is saved to every checkpoint_every trace rows, see reschedule.
+    # A state copies the ready queue, so the next one is at least as many rows further as there are queued jobs :
+    # the states never take more room than the trace, even when the queue grows without end (overloaded RM)
+    # resume : (checkpoint, trace of its run) to start from instead of time 0
+    # stream : EventBuffer the events are recorded in instead of a Trace, the horizon may then be math.inf
+    # stats : EngineStats of an instrumented run
+    processes = sorted(processes, key=lambda x: x.arrival_time) # the caller's list is left untouched
+    time = 0
+    process = None # process that is currently in the cpu
+    ready_queue = _ready_queue(priority, stats) # jobs waiting for the cpu, ordered by priority then arrival
+    trace = Trace() if stream is None else stream # every event of the schedule
     total_waiting_time = 0
-    completed = 0
+    deadline_misses = 0 # jobs completed after arrival_time + deadline, or dropped
     start_time = 0
-    n = len(processes)
 
-    # while all the process hasn't been processed
-    while completed != n:
-        # arrived process                   first apparition
-        arrived = [p for p in processes if p.arrival_time <= time]
-        for p in arrived:
-            ready_queue.append(p)                               # add it to the queue
-            ready_queue.sort(key=lambda x: x.burst_time)        # sort the ready queue by remaining time
-            ready_list.append([p.pid, time, -10])               # mark it as finished
-            processes.remove(p)                                 # remove the process from the list
+    # time limit : the hyperperiod unless another horizon is given, then the hyperperiod is math.inf if it is longer
+    h = hyperperiod(processes, horizon)
+    end = h if horizon is None else horizon
+    calendar = ReleaseCalendar(processes) # next release of every task
+
+    # steady state : the releases are the same in every hyperperiod, so if the jobs left at the start of two
+    # consecutive hyperperiods are the same, the schedule repeats itself until the end and needn't be simulated.
+    # With EDF, jobs are dropped by comparing their deadline with the time, so it only holds past every deadline
+    steady_from = _steady_from(processes, drop_expired)
+    if stream is not None:
+        steady_from = math.inf                      # every event is wanted, the repeated hyperperiods too
+    steady_state = None # start of the repeated hyperperiod, if one is found
+    boundary = h # next hyperperiod boundary
+    cycle_start = 0 # previous boundary
+    boundary_state = None # state at the previous boundary
+    cycle_waiting = [] # (time since the previous boundary, waiting time, missed) of the jobs completed or dropped since then
+
+    next_checkpoint = 0 # trace length from which the next checkpoint is saved
+    if resume is not None:
+        checkpoint, previous_trace = resume
+        (time, running, queued, ready_queue.counter, start_time, total_waiting_time, deadline_misses,
+         boundary, boundary_state, cycle_waiting, waiting_count, rows) = checkpoint
+        if boundary_state is None:                  # still in the first hyperperiod, which may have changed
+            boundary = h
+        else:
+            cycle_start = boundary - h
+        cycle_waiting = cycle_waiting[:waiting_count]
+        process = None if running is None else _job(*running)
+        ready_queue.heap = [(key, counter, _job(*job)) for key, counter, job in queued]
+        calendar = ReleaseCalendar(processes, time)
+        trace = previous_trace.head(rows)
+        next_checkpoint = rows + max(checkpoint_every, len(queued))   # as after the checkpoint in the first run
 
-        # if there is process in the queue
-        if ready_queue != [] or cpu != []:
+    while time < end:
+        if stream is not None and len(stream) > 0:
+            if stats is not None:
+                stats.count_events(stream)
+            yield
+        if checkpoints is not None and len(trace) >= next_checkpoint:
+            # cycle_waiting is only appended to or replaced, so its length is enough to get it back
+            checkpoints.append((time, None if process is None else _job_state(process),
+                                [(key, counter, _job_state(p)) for key, counter, p in ready_queue.heap],
+                                ready_queue.counter, start_time, total_waiting_time, deadline_misses,
+                                boundary, boundary_state, cycle_waiting, len(cycle_waiting), len(trace)))
+            next_checkpoint = len(trace) + max(checkpoint_every, len(ready_queue))
+
+        if time == boundary:
+            state = _periodic_state(time, process, start_time, ready_queue)
+            if state == boundary_state and time - h >= steady_from:
+                # extrapolate the waiting time of the repeated hyperperiod up to the end
+                cycles, rest = divmod(end - time, h)
+                total_waiting_time += cycles * sum(w for _, w, _ in cycle_waiting)
+                total_waiting_time += sum(w for offset, w, _ in cycle_waiting if offset < rest)
+                deadline_misses += cycles * sum(m for _, _, m in cycle_waiting)
+                deadline_misses += sum(m for offset, _, m in cycle_waiting if offset < rest)
+                steady_state = time - h
+                time = end
+                break
+            boundary_state = state
+            cycle_waiting = []
+            cycle_start = boundary
+            boundary += h
+        if stats is not None:
+            stats.iterations += 1
+            lap = perf_counter()
+
+        # released process, taken from the calendar
+        for p in calendar.pop_due(time):
+            new_instance = Process.record(p.pid, time, p.burst_time, p.period, p.deadline) # create a new process
+            ready_queue.push(new_instance)                              # add it to the ready_queue
+            trace.add(ARRIVE, new_instance.pid, time, time)             # mark it as arrived
+        if stats is not None:
+            lap = stats.lap(ADMISSION, lap)
+
+        # settle every completion and preemption happening at this instant
+        while len(ready_queue) > 0 or process is not None:
+            if drop_expired:
+                for p in ready_queue.drop_expired(time):
+                    trace.add(DROP, p.pid, p.arrival_time, time)        # we mark it as leaving the queue
+                    deadline_misses += 1
+                    cycle_waiting.append((time - cycle_start, 0, True))
 
             # if there is no process cpu
-            if cpu == []:
-                process = ready_queue.pop(0)                    # take the first process in the ready_queue
-                cpu.append(process.pid)                         # add the process to the cpu
-                ready_list.append([process.pid, -10, time])     # add to read_list the process that is currently processing
-                start_time = time                               # we reset the start time
-            
-            # if the process is finished 
-            if process.remaining_time <= 0: 
+            if process is None:
+                if len(ready_queue) == 0:
+                    break
+                process = ready_queue.pop()                             # take the first process in the ready_queue
+                trace.add(DISPATCH, process.pid, process.arrival_time, time) # add to read_list the process that is currently processing
+                start_time = time                                       # we reset the start time
+            if stats is not None:
+                lap = stats.lap(DISPATCH_PHASE, lap)
+
+            # if the process is finished
+            if process.remaining_time <= 0:
                 process.waiting_time = time - process.arrival_time
                 total_waiting_time += process.waiting_time
-                results.append([process.pid, start_time, time]) # we add it to the results
-                cpu.pop()                                       # remove the process from the cpu
-                start_time = time                               # increment the time
-                completed += 1                                  # increment the number of completed processes
-            
-            # if the process is not finished
-            else:                           
-                process.remaining_time -= 1                     # decrement the remaining time
-                time += 1                                       # increment the time
-        else:
-            time += 1
+                missed = process.waiting_time > process.deadline
+                deadline_misses += missed
+                cycle_waiting.append((time - cycle_start, process.waiting_time, missed))
+                trace.add(RUN, process.pid, start_time, time)           # we add it to the results
+                process = None                                          # remove the process from the cpu
+                start_time = time                                       # reset the start time
 
-    performances = total_waiting_time / n
-    return results, time, performances, ready_list
+            # if there is a process with a higher priority than the current one
+            elif len(ready_queue) > 0 and ready_queue.head_priority() < priority(process):
+                trace.add(RUN, process.pid, start_time, time)           # we add the current one in the results
+                ready_queue.push(process)                               # we add the current one in the ready_queue
+                trace.add(PREEMPT, process.pid, time, time)             # add the process that came back in the ready_queue
+                process = None                                          # remove the process from the cpu
+                start_time = time                                       # reset the start time
+
+            else:
+                break
+            if stats is not None:
+                lap = stats.lap(COMPLETION, lap)
+
+        # jump to the next release, completion, deadline or hyperperiod boundary, without going past the end
+        next_time = min(end, boundary, calendar.next_time())
+        if process is not None:
+            next_time = min(next_time, time + _ticks(process.remaining_time))
+        if drop_expired and len(ready_queue) > 0:
+            next_time = min(next_time, max(time + 1, math.ceil(ready_queue.head().deadline)))
+        if process is not None:
+            process.remaining_time -= next_time - time              # decrement the remaining time
+        time = next_time
+        if stats is not None:
+            stats.lap(ADVANCE, lap)
+
+    performances = total_waiting_time / len(processes)
+    return _summary(trace, time, performances, stats, time if steady_state is None else steady_state + h,
+                    deadline_misses=deadline_misses, hyperperiod=h, horizon=end, steady_state=steady_state)
 
-def rr_scheduling(processes, quantum=4):
-    processes.sort(key=lambda x: x.arrival_time)
-    ready_queue = [] # list : [pid, enter_time , -10(null value)] & [pid, -10(null value), leave_time]
-    ready_list = [] # list that contains [pid, start_time, end_time]
+def _task_set(processes):
+    return processes if isinstance(processes, TaskSet) else TaskSet.from_processes(processes)
+
+def _stats(instrument):
+    return EngineStats() if instrument else None
+
+# every scheduler takes a list of Process or Task, or a TaskSet, and never changes them.
+# instrument : count the operations of the engine and time its phases, in the stats attribute of the result (EngineStats)
+
+def fcfs_scheduling(processes, vectorized=None, instrument=False):
+    # vectorized : evaluate with NumPy, by default only from VECTORIZED_THRESHOLD processes
+    if vectorized is None:
+        vectorized = len(processes) >= VECTORIZED_THRESHOLD
+    if vectorized:
+        return _run_non_preemptive_vectorized(_task_set(processes), stats=_stats(instrument))
+    return _result(_run_non_preemptive(_records(processes), stats=_stats(instrument)))
+
+def sjn_scheduling(processes, vectorized=None, instrument=False):
+    # vectorized : evaluate with NumPy, by default only from VECTORIZED_THRESHOLD processes
+    if vectorized is None:
+        vectorized = len(processes) >= VECTORIZED_THRESHOLD
+    if vectorized:
+        return _run_non_preemptive_vectorized(_task_set(processes), by="burst_time", stats=_stats(instrument))
+    return _result(_run_non_preemptive(_records(processes), priority=lambda x: x.burst_time, stats=_stats(instrument)))
+
+def rr_scheduling(processes, quantum=4, instrument=False):
+    return _result(_run_round_robin(_records(processes), quantum, stats=_stats(instrument)))
+
+def _run_round_robin(processes, quantum=4, stream=None, stats=None):
+    # stream : EventBuffer the events are recorded in instead of a Trace
+    # stats : EngineStats of an instrumented run
+    arrivals = sorted(processes, key=lambda x: x.arrival_time) # the caller's list is left untouched
+    next_arrival = 0 # index in arrivals of the first process that hasn't arrived yet
+    ready_queue = _ready_queue(None, stats) # processes waiting for the cpu, in arrival order
+    trace = Trace() if stream is None else stream # every event of the schedule
     time = 0
-    cpu = [] # list that contains the process that is currently processing
-    results = []
+    process = None # process that is currently in the cpu
     total_waiting_time = 0
+    deadline_misses = 0 # processes completed after arrival_time + deadline
     completed = 0
     start_time = 0
     n = len(processes)
@@ -136,193 +684,292 @@ def rr_scheduling(processes, quantum=4):
 
     # while all the process hasn't been processed
     while completed != n:
+        if stream is not None and len(stream) > 0:
+            if stats is not None:
+                stats.count_events(stream)
+            yield
+        if stats is not None:
+            stats.iterations += 1
+            lap = perf_counter()
         # arrived process                   first apparition
-        arrived = [p for p in processes if p.arrival_time <= time]
-        for p in arrived:
-            ready_queue.append(p)                               # add it to the queue
-            ready_list.append([p.pid, time, -10])               # mark it as finished
-            processes.remove(p)                                 # remove the process from the list 
-        
-        # if there is process in the queue or in the cpu
-        if ready_queue != [] or cpu != []:
-            
-            # if there is no process cpu
-            if cpu == []:
-                process = ready_queue.pop(0)                        # take the first process in the ready_queue
-                cpu.append(process.pid)                             # add the process to the cpu
-                ready_list.append([process.pid, -10, time])         # add to read_list the process that is currently processing
-                start_time = time                                   # we reset the start time
-
-            # if the process is finished 
-            if process.remaining_time <= 0: 
-                process.waiting_time = time - process.arrival_time
-                total_waiting_time += process.waiting_time
-                results.append([process.pid, start_time, time]) # we add it to the results
-                cpu.pop()                                       # remove the process from the cpu       
-                start_time = time                               # reset the start time
-                completed += 1                                  # increment the number of completed processes
-                temp_q = quantum                                # reset the quantum
-                
-            # if the quantum is finished
-            elif temp_q == 0:               
-                process.arrival = time                          # set the arrival time to the current time
-                results.append([process.pid, start_time, time]) # add it to the results
-                ready_queue.append(process)                     # add it at the ready_queue
-                ready_list.append([process.pid, time, -10])     # add to read_list the process that is currently processing 
-                cpu.pop()                                       # remove the process from the cpu
-                start_time = time                               # reset the start time
-                temp_q = quantum                                # reset the quantum
-            
-            else:                           
-                process.remaining_time -= 1                     # decrement the remaining time
-                temp_q -= 1                                     # decrement the quantum
-                time += 1                                       # increment the time
+        while next_arrival < n and arrivals[next_arrival].arrival_time <= time:
+            p = arrivals[next_arrival]
+            ready_queue.push(p)                                 # add it to the queue
+            trace.add(ARRIVE, p.pid, time, time)                # mark it as arrived
+            next_arrival += 1                                   # move the cursor past the process
+        if stats is not None:
+            lap = stats.lap(ADMISSION, lap)
+
+        # if there is no process in the cpu
+        if process is None and len(ready_queue) > 0:
+            process = ready_queue.pop()                         # take the first process in the ready_queue
+            trace.add(DISPATCH, process.pid, math.ceil(process.arrival_time), time) # add to read_list the process that is currently processing
+            start_time = time                                   # we reset the start time
+        if stats is not None:
+            lap = stats.lap(DISPATCH_PHASE, lap)
+
+        # if the cpu is idle, jump to the next arrival
+        if process is None:
+            time = math.ceil(arrivals[next_arrival].arrival_time)
+            if stats is not None:
+                stats.lap(ADVANCE, lap)
+            continue
+
+        # if the process is finished
+        if process.remaining_time <= 0:
+            process.waiting_time = time - process.arrival_time
+            total_waiting_time += process.waiting_time
+            if process.waiting_time > process.deadline:
+                deadline_misses += 1
+            trace.add(RUN, process.pid, start_time, time)       # we add it to the results
+            process = None                                      # remove the process from the cpu
+            start_time = time                                   # reset the start time
+            completed += 1                                      # increment the number of completed processes
+            temp_q = quantum                                    # reset the quantum
+
+        # if the quantum is finished
+        elif temp_q == 0:
+            process.arrival = time                              # set the arrival time to the current time
+            trace.add(RUN, process.pid, start_time, time)       # add it to the results
+            ready_queue.push(process)                           # add it at the ready_queue
+            trace.add(REQUEUE, process.pid, time, time)         # mark it as back in the ready_queue
+            process = None                                      # remove the process from the cpu
+            start_time = time                                   # reset the start time
+            temp_q = quantum                                    # reset the quantum
+
+        # run the process until it finishes, its quantum expires or the next arrival
         else:
-            time += 1
+            next_time = time + _ticks(process.remaining_time)
+            if temp_q > 0:
+                next_time = min(next_time, time + _ticks(temp_q))
+            if next_arrival < n:
+                next_time = min(next_time, math.ceil(arrivals[next_arrival].arrival_time))
+            process.remaining_time -= next_time - time          # decrement the remaining time
+            temp_q -= next_time - time                          # decrement the quantum
+            time = next_time                                    # jump to the next event
+            if stats is not None:
+                stats.lap(ADVANCE, lap)
+            continue
+
+        if stats is not None:
+            stats.lap(COMPLETION, lap)
 
     performances = total_waiting_time / n
-    return results, time, performances, ready_list
+    return _summary(trace, time, performances, stats, deadline_misses=deadline_misses)
 
-def rm_scheduling(processes): 
-    processes.sort(key=lambda x: x.arrival_time)
-    time = 0
-    cpu = [] # list that contains the process that is currently processing
-    results = []
-    ready_queue = [] # list : [pid, enter_time , -10(null value)] & [pid, -10(null value), leave_time]
-    ready_list = [] # list that contains [pid, start_time, end_time]
-    total_waiting_time = 0
-    start_time = 0
-    STOP = False
+def rm_scheduling(processes, horizon=None, instrument=False):
+    # horizon : end of the simulation, the hyperperiod by default
+    return _result(_run_periodic(_records(processes), priority=lambda x: x.period, horizon=horizon,
+                                 stats=_stats(instrument)))
 
-    # time limit
-    hyperperiod = np.lcm.reduce([p.period for p in processes if p.period]) # hyperperiod = LCM of all periods
-    
-    while time < hyperperiod:
-        if STOP == False:
-            # arrived process                       first apparition                    periodic apparition
-            arrived = [p for p in processes if (time == p.arrival_time or (time - p.arrival_time) % p.period == 0)]
-            # print("time",time)
-            for p in arrived:
-                # print("process :", p.pid, "arrivée à", time)
-                new_instance = Process(p.pid, time, p.burst_time, p.period) # create a new process
-                ready_queue.append(new_instance)                            # add it to the ready_queue
-                ready_queue.sort(key=lambda x: x.period)                    # sort the list
-                ready_list.append([new_instance.pid, time, -10])            # mark it as arrived
-            # print("coucou1")
-        STOP = False
-        # if there is process in the queue or in the cpu
-        if ready_queue != [] or cpu != []:
-            
-            # if there is no process cpu
-            if cpu == []:
-                process = ready_queue.pop(0)                        # take the first process in the ready_queue
-                cpu.append(process.pid)                             # add the process to the cpu
-                ready_list.append([process.pid, -10, time])         # add to read_list the process that is currently processing
-                start_time = time                                   # we reset the start time
-                # print("check cpu")            
-
-            # if the process is finished 
-            if process.remaining_time <= 0: 
-                process.waiting_time = time - process.arrival_time
-                total_waiting_time += process.waiting_time
-                results.append([process.pid, start_time, time]) # we add it to the results
-                cpu.pop()                                       # remove the process from the cpu       
-                start_time = time                               # reset the start time
-                # print("check finish")
-                STOP = True
-
-            # if there is a process with a shorter period than the current one
-            elif any(p.period < process.period for p in ready_queue):
-                # print("process :", process.pid, " qui est retiré, period :",process.period)
-                results.append([process.pid, start_time, time])     # we add the current one in the results
-                ready_queue.append(process)                         # we add the current one in the ready_queue
-                ready_queue.sort(key=lambda x: x.period)                # we sort the list to have the first element with the shortest period
-                ready_list.append([process.pid, -10, time])             # add the process that came back in the ready_queue
-                cpu.pop()                                               # remove the process from the cpu
-                start_time = time                                       # reset the start time
-                # print("check1 inf-period", process.pid)
-                STOP = True
+def edf_scheduling(processes, horizon=None, instrument=False):
+    # horizon : end of the simulation, the hyperperiod by default
+    return _result(_run_periodic(_records(processes), priority=lambda x: x.deadline, drop_expired=True, horizon=horizon,
+                                 stats=_stats(instrument)))
 
-            else:
-                process.remaining_time -= 1                             # decrement the remaining time
-                time += 1                                               # increment the time
-                # print("check indent")
-        else:
-            time += 1                                                   # increment the time
+class Checkpoints:
+    """
+    States of a scheduler saved during a run by reschedule, to simulate an edited task set again from the last state
+    the edit doesn't change instead of from time 0.
 
-    performances = total_waiting_time / len(processes)
-    return results, time, performances, ready_list
+    Attributes:
+        scheduler: Scheduler that was run (fcfs_scheduling, sjn_scheduling, rm_scheduling or edf_scheduling).
+        options: Options it was run with.
+        tasks: (pid, arrival_time, burst_time, period, deadline) of every process, sorted by arrival time.
+        states: The saved states, in chronological order. Their first item is the time they were saved at.
+        trace: Trace of the run.
+        hyperperiod: Hyperperiod of the task set (RM and EDF only), math.inf past the horizon of the options.
+        steady_from: Time from which the run could stop on a repeated hyperperiod (RM and EDF only).
+        first: Index of states[0] in the states of the whole run, not 0 for a part (see part and complete).
 
-def edf_scheduling(processes): 
-    processes.sort(key=lambda x: x.arrival_time)
-    time = 0
-    cpu = [] # list that contains the process that is currently processing
-    results = []
-    ready_queue = [] # list : [pid, enter_time , -10(null value)] & [pid, -10(null value), leave_time]
-    ready_list = [] # list that contains [pid, start_time, end_time]
-    total_waiting_time = 0
-    start_time = 0
-    STOP = False
-
-    # time limit
-    hyperperiod = np.lcm.reduce([p.period for p in processes if p.period]) # hyperperiod = LCM of all periods
-
-    while time < hyperperiod:
-        if STOP == False:
-            # arrived process                       first apparition                    periodic apparition
-            arrived = [p for p in processes if (time == p.arrival_time or (time - p.arrival_time) % p.period == 0)]
-            for p in arrived:
-                new_instance = Process(p.pid, time, p.burst_time, p.period, p.deadline) # create a new process
-                ready_queue.append(new_instance)                            # add it to the ready_queue
-                ready_queue.sort(key=lambda x: x.deadline)                    # sort the list
-                ready_list.append([new_instance.pid, time, -10])            # mark it as arrived
-                # print("ready list (arrivée):", ready_list)
-        STOP = False
-        # if there is process in the queue or in the cpu
-        if ready_queue != [] or cpu != []:
-            
-            # loop to look for a process 
-            for p in ready_queue:
-                # if the process reaches its deadline
-                if p.deadline <= time:
-                    ready_queue.remove(p)                           # we erase it
-                    ready_list.append([p.pid, -10, time])           # we mark it as leaving the queue
-            
-            # if there is no process cpu
-            if cpu == []:
-                process = ready_queue.pop(0)                        # take the first process in the ready_queue
-                cpu.append(process.pid)                             # add the process to the cpu
-                ready_list.append([process.pid, -10, time])         # add to read_list the process that is currently processing
-                start_time = time                                   # we reset the start time
-
-            # if the process is finished 
-            if process.remaining_time <= 0: 
-                process.waiting_time = time - process.arrival_time
-                total_waiting_time += process.waiting_time
-                results.append([process.pid, start_time, time]) # we add it to the results
-                cpu.pop()                                       # remove the process from the cpu       
-                start_time = time                               # reset the start time
-                STOP = True
-
-            # if there is a process with a shorter deadline than the curreznt one
-            elif any(p.deadline < process.deadline for p in ready_queue):
-                results.append([process.pid, start_time, time])     # we add the current one in the results
-                ready_queue.append(process)                         # we add the current one in the ready_queue
-                ready_queue.sort(key=lambda x: x.deadline)          # we sort the list to have the first element with the shortest period
-                ready_list.append([process.pid, -10, time])         # add the process that came back in the ready_queue
-                cpu.pop()                                       # remove the process from the cpu
-                start_time = time                               # reset the start time
-                # print("ready list (retour):", ready_list)
-                STOP = True
-            
+    Methods:
+        last_valid(processes, options): Returns the index in states to resume an edited task set from, or None.
+        part(index): Returns the checkpoints reduced to the state index and the trace rows before it.
+        complete(previous): Puts back the states of previous that come before states[0].
+    """
+    def __init__(self, scheduler, options, processes, states, trace):
+        self.scheduler = scheduler
+        self.options = options
+        self.tasks = _tasks(processes)
+        self.states = states
+        self.trace = trace
+        self.first = 0
+        self.hyperperiod = None
+        self.steady_from = None
+        engine, arguments = _RESUMABLE[scheduler]
+        if engine is _run_periodic and len(processes) > 0:
+            self.hyperperiod = hyperperiod(processes, options.get('horizon'))
+            self.steady_from = _steady_from(processes, arguments.get('drop_expired', False))
+
+    def last_valid(self, processes, options):
+        if options != self.options or len(processes) == 0:
+            return None
+        engine, arguments = _RESUMABLE[self.scheduler]
+        tasks = _tasks(processes)
+        # a state is still valid if every process it has seen is unchanged, the states are checked from the last one
+        if engine is _run_non_preemptive:
+            # processes are taken in arrival order : the ones before the first change are the same,
+            # and the process following the ones admitted must not arrive before the state.
+            # If there is no such process, the cpu must still have work, otherwise the new run ended before
+            first_change = next((i for i, (a, b) in enumerate(zip(self.tasks, tasks)) if a != b),
+                                min(len(self.tasks), len(tasks)))
+            for i in range(len(self.states) - 1, -1, -1):
+                time, admitted, queued, _, running = self.states[i][:5]
+                if admitted > first_change:
+                    continue
+                if admitted < len(tasks) and math.ceil(tasks[admitted][1]) >= time:
+                    return i
+                if admitted == len(tasks) and (running is not None or len(queued) > 0):
+                    return i
+            return None
+
+        # periodic tasks : the state must come before the first release of every added, edited or removed task
+        added, removed = list(tasks), []
+        for task in self.tasks:
+            if task in added:
+                added.remove(task)
             else:
-                process.remaining_time -= 1                         # decrement the remaining time
-                time += 1
-        else:
-            time += 1
+                removed.append(task)
+        limit = min((_first_release(Process(*task)) for task in added + removed), default=math.inf)
+        horizon = options.get('horizon')
+        h = hyperperiod(processes, horizon)
+        limit = min(limit, h if horizon is None else horizon)
+        if h != self.hyperperiod or _steady_from(processes, arguments.get('drop_expired', False)) != self.steady_from:
+            limit = min(limit, h, self.hyperperiod)    # the hyperperiod boundaries already passed are no longer the same
+        for i in range(len(self.states) - 1, -1, -1):
+            if self.states[i][0] <= limit:
+                return i
+        return None
 
-    performances = total_waiting_time / len(processes)
-    return results, time, performances, ready_list
+    def part(self, index):
+        # what reschedule needs to resume from the state index, much smaller to send to another process
+        part = copy.copy(self)
+        part.states = [self.states[index]]
+        part.trace = self.trace.head(self.states[index][-1])    # the last item of a state is the length of the trace
+        part.first = self.first + index
+        return part
+
+    def complete(self, previous):
+        # after a run resumed from a part of previous : the states before the part are the same in this run
+        self.states[:0] = previous.states[:self.first - previous.first]
+        self.first = previous.first
+
+def _tasks(processes):
+    return [(p.pid, p.arrival_time, p.burst_time, p.period, p.deadline)
+            for p in sorted(processes, key=lambda x: x.arrival_time)]
+
+def reschedule(scheduler, processes, previous=None, checkpoint_every=CHECKPOINT_EVERY, **options):
+    """
+    Same schedule as scheduler(processes, **options), saving checkpoints along the way.
+    If previous is the result of an earlier call with the same scheduler and options, on a task set that has been
+    edited since then, the simulation starts again from the last checkpoint the edit doesn't change :
+    with FCFS and SJN everything before the arrival of the edited process, with RM and EDF everything before the
+    first release of the edited task.
+    Other schedulers (RR) are simply run.
+
+    Args:
+        scheduler: fcfs_scheduling, sjn_scheduling, rm_scheduling or edf_scheduling.
+        processes: List of Process.
+        previous: ScheduleResult of the previous call, its Checkpoints or a part of them (see resume_point), or None.
+        checkpoint_every: Number of trace rows between two checkpoints, more while the ready queue is longer.
+        options: Options of the scheduler (horizon of RM and EDF, instrument).
+
+    Returns:
+        The ScheduleResult, with a checkpoints attribute (Checkpoints) to give to the next call.
+    """
+    if scheduler not in _RESUMABLE:
+        return scheduler(processes, **options)
+    processes = _records(processes)
+    stats = _stats(options.get('instrument'))
+    options = _resume_options(options)
+    engine, arguments = _RESUMABLE[scheduler]
+    states, resume, first = [], None, 0
+    old = previous if isinstance(previous, Checkpoints) else getattr(previous, 'checkpoints', None)
+    if old is not None and old.scheduler is scheduler:
+        i = old.last_valid(processes, options)
+        if i is not None:
+            states = old.states[:i + 1]             # the states up to i are the same in the new run
+            resume = (old.states[i], old.trace)
+            first = old.first
+    result = _result(engine(processes, **arguments, **options, checkpoints=states, checkpoint_every=checkpoint_every,
+                            resume=resume, stats=stats))
+    result.checkpoints = Checkpoints(scheduler, options, processes, states, result.trace)
+    result.checkpoints.first = first
+    return result
+
+def _resume_options(options):
+    # only the event loop can be resumed, and instrumenting a run doesn't change where it can resume from
+    return {k: v for k, v in options.items() if k not in ('vectorized', 'instrument')}
+
+def resume_point(scheduler, processes, previous, **options):
+    """
+    The part of previous that reschedule(scheduler, processes, previous, **options) resumes from : Checkpoints with
+    only the state it starts from and the trace rows before it, or None if it would run from time 0.
+    Give it to reschedule instead of previous when the schedule is computed in another process : previous holds
+    its whole trace and every state. The states before the part are put back in the new schedule with
+    result.checkpoints.complete(previous.checkpoints).
+    """
+    old = getattr(previous, 'checkpoints', None)
+    if old is None or old.scheduler is not scheduler:
+        return None
+    i = old.last_valid(_records(processes), _resume_options(options))
+    return None if i is None else old.part(i)
+
+_kept = {} # Checkpoints of the last schedule of each scheduler computed by reschedule_kept in this process
+
+def reschedule_kept(scheduler, processes, **options):
+    """
+    reschedule from the checkpoints of the previous call with the same scheduler in this process, which keeps them
+    instead of returning them : the ScheduleResult has no checkpoints attribute. Meant for a worker process dedicated
+    to one scheduler, so only the schedule is sent back and the next edited task set still resumes from the states.
+    """
+    result = reschedule(scheduler, processes, _kept.get(scheduler), **options)
+    _kept[scheduler] = vars(result).pop('checkpoints', None)
+    return result
+
+_RESUMABLE = {
+    fcfs_scheduling: (_run_non_preemptive, {}),
+    sjn_scheduling: (_run_non_preemptive, {'priority': lambda x: x.burst_time}),
+    rm_scheduling: (_run_periodic, {'priority': lambda x: x.period}),
+    edf_scheduling: (_run_periodic, {'priority': lambda x: x.deadline, 'drop_expired': True}),
+}
+
+_STREAMABLE = dict(_RESUMABLE)
+_STREAMABLE[rr_scheduling] = (_run_round_robin, {})
+
+def stream_schedule(scheduler, processes, **options):
+    """
+    Generator of the events of scheduler(processes, **options), yielded while the schedule is simulated,
+    so a long schedule can be read in constant memory and the first events are available right away.
+    With rm_scheduling and edf_scheduling, horizon=math.inf gives an endless schedule.
+    FCFS and SJN always use the event loop here, even for large task sets.
+
+    Yields:
+        Event(kind, pid, start, end), in the order of the trace of scheduler :
+        ARRIVE (enqueued), DISPATCH, RUN (a slice on the cpu, the process completed unless a PREEMPT or
+        REQUEUE of it follows at its end), PREEMPT, REQUEUE (end of a RR quantum) and DROP (deadline missed, EDF).
+        The start of DISPATCH and DROP is the release of the job, their end the time of the event.
+
+    Returns:
+        The ScheduleResult of the run without results and ready_list (None), as the value of the StopIteration,
+        with its stats when instrument=True.
+    """
+    engine, arguments = _STREAMABLE[scheduler]
+    stats = _stats(options.get('instrument'))
+    options = {k: v for k, v in options.items() if k not in ('vectorized', 'instrument')}
+    events = EventBuffer()
+    run = engine(_records(processes), **arguments, **options, stream=events, stats=stats)
+    while True:
+        try:
+            next(run)
+            summary = None
+        except StopIteration as stop:
+            summary = stop
+        for event in events:
+            yield Event(*event)
+        events.clear()
+        if summary is not None:
+            return summary.value
 
 if __name__ == "__main__":
     # test exemple
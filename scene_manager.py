@@ -0,0 +1,113 @@
+import pygame
+
+from frame_loop import FrameLoop, FRAME_RATE
+
+def open_display(size, caption=None):
+    """
+    The window of the game, opened once : a scene of another size resizes it instead of opening another one.
+    pygame keeps the same display surface, so the screen attribute of the scenes stays valid.
+    """
+    pygame.init()
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != tuple(int(v) for v in size):
+        screen = pygame.display.set_mode(size)
+    if caption is not None:
+        pygame.display.set_caption(caption)
+    return screen
+
+class SceneManager:
+    """
+    Stack of the screens of the game (scenes) shown one at a time in a single window, by a single FrameLoop.
+    Going to another screen pushes a scene or replaces the current one, going back pops it : the loops are never
+    nested, and a scene that leaves the stack is forgotten with everything it holds.
+
+    A scene has the attributes size and caption of the window while it is shown, and the methods
+    handle_event(event) and draw(), and optionally animating() and dirty_rects() (see FrameLoop.run),
+    enter() called when it is pushed, resume() when the scene above it is popped and exit() when it leaves the
+    stack. The manager sets its manager attribute.
+
+    Attributes:
+        scenes: The stack, the scene shown last.
+        loop: FrameLoop of the window.
+
+    Methods:
+        run(scene): Shows the scene until the window is closed or the stack is empty, then closes pygame.
+            While the manager is already running, the scene is pushed instead.
+        push(scene): Shows the scene above the current one.
+        pop(): Goes back to the previous scene, ends the loop if there is none.
+        replace(scene): Shows the scene instead of the current one.
+        pop_to_root(): Goes back to the first scene.
+        stop(): Ends the loop after the current frame.
+    """
+    def __init__(self, max_fps=FRAME_RATE):
+        self.scenes = []
+        self.loop = FrameLoop(max_fps)
+        self.changed = False    # the next frame draws the whole window
+
+    def run(self, scene):
+        if self.loop.running:
+            self.push(scene)
+            return
+        self.push(scene)
+        self.loop.run(self.handle_event, self.draw, self.animating, self.dirty_rects)
+        while self.scenes:
+            self._leave(self.scenes.pop())
+        pygame.quit()
+
+    def push(self, scene):
+        self.scenes.append(scene)
+        self._show(scene)
+        scene.manager = self
+        if hasattr(scene, 'enter'):
+            scene.enter()
+
+    def pop(self):
+        self._leave(self.scenes.pop())
+        if not self.scenes:
+            self.stop()
+            return
+        self._show(self.scenes[-1])
+        if hasattr(self.scenes[-1], 'resume'):
+            self.scenes[-1].resume()
+
+    def replace(self, scene):
+        self._leave(self.scenes.pop())
+        self.push(scene)
+
+    def pop_to_root(self):
+        while len(self.scenes) > 2:
+            self._leave(self.scenes.pop())
+        if len(self.scenes) == 2:
+            self.pop()
+
+    def stop(self):
+        self.loop.stop()
+
+    def _show(self, scene):
+        open_display(scene.size, getattr(scene, 'caption', None))
+        self.changed = True
+
+    def _leave(self, scene):
+        if hasattr(scene, 'exit'):
+            scene.exit()
+        scene.manager = None
+
+    # FrameLoop callbacks, given to the scene on top of the stack
+    def handle_event(self, event):
+        if self.scenes:
+            self.scenes[-1].handle_event(event)
+
+    def draw(self):
+        if self.scenes:
+            self.scenes[-1].draw()
+
+    def animating(self):
+        scene = self.scenes[-1] if self.scenes else None
+        return scene is not None and hasattr(scene, 'animating') and scene.animating()
+
+    def dirty_rects(self):
+        scene = self.scenes[-1] if self.scenes else None
+        if self.changed or scene is None or not hasattr(scene, 'dirty_rects'):
+            self.changed = False
+            return None
+        return scene.dirty_rects()
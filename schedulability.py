@@ -0,0 +1,220 @@
+import math
+
+# verdicts of the tests
+SCHEDULABLE = "schedulable"
+NOT_SCHEDULABLE = "not schedulable"
+UNKNOWN = "unknown"     # the test used is only sufficient and didn't conclude, the task set has to be simulated
+
+class Verdict:
+    """
+    Answer of a schedulability test on a set of periodic Process.
+    The tests use the classical model : every job of a task must end before its release + deadline.
+
+    Attributes:
+        verdict: SCHEDULABLE, NOT_SCHEDULABLE or UNKNOWN.
+        test: Name of the test that gave the verdict ("U <= 1", "Liu & Layland", "hyperbolic", "QPA", ...).
+        utilization: Total utilization of the task set, sum of burst_time / period.
+        bound: Value the task set was compared with : the utilization bound, or the length of the interval checked by QPA.
+        response_times: {pid: worst-case response time} when the verdict comes from the response-time analysis.
+
+    Methods:
+        known(): True if the verdict is SCHEDULABLE or NOT_SCHEDULABLE.
+    """
+    def __init__(self, verdict, test, utilization, bound, response_times=None):
+        self.verdict = verdict
+        self.test = test
+        self.utilization = utilization
+        self.bound = bound
+        self.response_times = response_times
+
+    def known(self):
+        return self.verdict != UNKNOWN
+
+    def __bool__(self):
+        return self.verdict == SCHEDULABLE
+
+    def __repr__(self):
+        return f"Verdict({self.verdict!r}, test={self.test!r}, utilization={self.utilization:.3f}, bound={self.bound})"
+
+def utilization(processes):
+    return sum(p.burst_time / p.period for p in processes)
+
+def liu_layland_bound(n):
+    # n(2^(1/n) - 1) : 1 for one task, tends to ln 2 ~ 0.693
+    return n * (2 ** (1 / n) - 1) if n > 0 else 1
+
+def _implicit_deadlines(processes):
+    # the utilization bounds only hold when every deadline is at least the period
+    return all(p.deadline >= p.period for p in processes)
+
+def rm_test(processes, exact=True):
+    """
+    Schedulability test of Rate Monotonic.
+    U > 1 is never schedulable. Then the Liu & Layland bound and the hyperbolic bound (Bini, Buttazzo) are tried in O(n),
+    both are only sufficient and need deadlines at least equal to the periods.
+    When they don't conclude, the response-time analysis gives the exact answer, or UNKNOWN if exact is False.
+    Tasks with the same period may run in any order, the analysis then takes the worst one and can be pessimistic.
+    """
+    u = utilization(processes)
+    if u > 1:
+        return Verdict(NOT_SCHEDULABLE, "U <= 1", u, 1)
+    if _implicit_deadlines(processes):
+        bound = liu_layland_bound(len(processes))
+        if u <= bound:
+            return Verdict(SCHEDULABLE, "Liu & Layland", u, bound)
+        product = math.prod(p.burst_time / p.period + 1 for p in processes)
+        if product <= 2:
+            return Verdict(SCHEDULABLE, "hyperbolic", u, product)
+        if not exact:
+            return Verdict(UNKNOWN, "hyperbolic", u, product)
+    elif not exact:
+        return Verdict(UNKNOWN, "constrained deadlines", u, None)
+    return rta_test(processes)
+
+def _priority_key(order):
+    return (lambda p: p.deadline) if order == "deadline" else (lambda p: p.period)
+
+def priority_order(processes, order="period"):
+    # processes from the highest to the lowest priority : shortest period (RM) or shortest deadline (DM) first.
+    # Equal values keep the order of the list, but it says nothing about which runs first : the ready queue of the
+    # simulator breaks ties with an insertion counter that changes with every preemption, see response_times
+    return sorted(processes, key=_priority_key(order))
+
+def _level_busy_period(higher, process, start):
+    # length of the level-i busy period : the processor runs process or a higher priority task from 0 to there
+    w = start
+    while True:
+        nxt = sum(-(-w // p.period) * p.burst_time for p in higher) + -(-w // process.period) * process.burst_time
+        if nxt == w:
+            return w
+        w = nxt
+
+def response_times(processes, order="period"):
+    """
+    Worst-case response time of every task with fixed priorities, by fixed-point iteration (Joseph & Pandya, Lehoczky).
+    The worst case happens when every task is released at the same time, so the arrival times are ignored.
+    The job number q of the busy period ends at w = (q + 1) * burst_time + sum(ceil(w / period_j) * burst_time_j)
+    over the tasks j that can run before it : the higher priority tasks, and the other tasks with the same priority,
+    since the simulator may run any of them first. Its response time is w - q * period. Only the first job has to be
+    checked when the response time is at most the period, which is the case with deadline <= period.
+    Tasks are taken by decreasing priority and the first iteration of a task starts from the end of the first job
+    of the previous one plus its own burst_time, a lower bound of the fixed point, so each task only needs a few steps.
+
+    Args:
+        processes: List of Process.
+        order: "period" for Rate Monotonic priorities, "deadline" for Deadline Monotonic priorities.
+
+    Returns:
+        {pid: worst-case response time}, math.inf for the tasks whose busy period never ends (utilization above 1).
+    """
+    times = {}
+    ordered = priority_order(processes, order)
+    key = _priority_key(order)
+    end = 0             # end of the tasks with the priority of the current one in ordered
+    previous = 0        # end of the first job of the previous task, with a higher priority
+    for i, process in enumerate(ordered):
+        if end <= i:
+            start = previous            # first task of its priority
+            end = i + 1
+            while end < len(ordered) and key(ordered[end]) == key(process):
+                end += 1
+        higher = ordered[:i] + ordered[i + 1:end]      # tasks that can run before a job of process
+        if process.burst_time / process.period + sum(p.burst_time / p.period for p in higher) > 1:
+            times[process.pid] = math.inf
+            continue
+        busy = None
+        worst = 0
+        q = 0
+        w = start + process.burst_time + sum(p.burst_time for p in ordered[i + 1:end])
+        while True:
+            while True:
+                nxt = (q + 1) * process.burst_time + sum(-(-w // p.period) * p.burst_time for p in higher)
+                if nxt == w:
+                    break
+                w = nxt
+            if q == 0:
+                previous = max(previous, w)
+            worst = max(worst, w - q * process.period)
+            if w <= (q + 1) * process.period:      # the job ends before the next release, the busy period is over
+                break
+            if busy is None:
+                busy = _level_busy_period(higher, process, w)
+            q += 1
+            if q * process.period >= busy:
+                break
+            w = max(w, q * process.period) + process.burst_time
+        times[process.pid] = worst
+    return times
+
+def rta_test(processes, order="period"):
+    # exact test of fixed priorities : every worst-case response time is at most the deadline
+    times = response_times(processes, order)
+    u = utilization(processes)
+    ok = all(times[p.pid] <= p.deadline for p in processes)
+    return Verdict(SCHEDULABLE if ok else NOT_SCHEDULABLE, "response time", u, None, times)
+
+def demand(processes, t):
+    # processor demand in [0, t] : execution time of the jobs released and due inside the interval
+    return sum((p.burst_time * ((t - p.deadline) // p.period + 1) for p in processes if p.deadline <= t))
+
+def _last_deadline_before(processes, t):
+    # largest absolute deadline k * period + deadline strictly before t, None if there is none
+    last = None
+    for p in processes:
+        if p.deadline < t:
+            k = -((p.deadline - t) // p.period) - 1     # ceil((t - deadline) / period) - 1
+            d = k * p.period + p.deadline
+            last = d if last is None else max(last, d)
+    return last
+
+def _busy_period(processes):
+    # length of the synchronous busy period : w = sum(ceil(w / period) * burst_time) until it doesn't change
+    w = sum(p.burst_time for p in processes)
+    while True:
+        nxt = sum(-(-w // p.period) * p.burst_time for p in processes)
+        if nxt == w:
+            return w
+        w = nxt
+
+def qpa_bound(processes, u):
+    # interval QPA has to check : the busy period, or the bound of Baruah et al. when U < 1 if it is shorter
+    bound = _busy_period(processes)
+    if u < 1:
+        la = max(max(p.deadline for p in processes),
+                 sum((p.period - p.deadline) * p.burst_time / p.period for p in processes) / (1 - u))
+        bound = min(bound, la)
+    return bound
+
+def edf_test(processes):
+    """
+    Exact test of EDF on one processor.
+    With deadlines at least equal to the periods, U <= 1 is enough, in O(n).
+    Otherwise QPA (Zhang & Burns) checks the processor demand h(t) <= t, going backwards from the end of the
+    interval to check and jumping from h(t) to h(h(t)), so only a few of the absolute deadlines are visited.
+    """
+    u = utilization(processes)
+    if u > 1:
+        return Verdict(NOT_SCHEDULABLE, "U <= 1", u, 1)
+    if _implicit_deadlines(processes):
+        return Verdict(SCHEDULABLE, "U <= 1", u, 1)
+
+    bound = qpa_bound(processes, u)
+    d_min = min(p.deadline for p in processes)
+    t = _last_deadline_before(processes, bound)
+    if t is None:                               # no deadline to check before the bound
+        return Verdict(SCHEDULABLE, "QPA", u, bound)
+    h = demand(processes, t)
+    while h <= t and h > d_min:
+        t = h if h < t else _last_deadline_before(processes, t)
+        h = demand(processes, t)
+    if h <= d_min:
+        return Verdict(SCHEDULABLE, "QPA", u, bound)
+    return Verdict(NOT_SCHEDULABLE, "QPA", u, bound)
+
+TESTS = {"RM": rm_test, "EDF": edf_test}
+
+def check(algorithm, processes):
+    # verdict of the algorithm on the task set, None for the algorithms without a test (FCFS, SJN, RR)
+    if algorithm not in TESTS or len(processes) == 0:
+        return None
+    return TESTS[algorithm](processes)
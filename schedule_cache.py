@@ -0,0 +1,170 @@
+import atexit
+import hashlib
+import inspect
+import sqlite3
+import sys
+import warnings
+from collections import OrderedDict
+
+from schedule_store import ScheduleStore
+
+def fingerprint(processes):
+    """
+    Canonical hash of a task set : the parameters of every Process, in the order of the list.
+    The order is kept because the schedulers break ties with it, so two lists in a different order may not
+    give the same schedule.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for p in processes:
+        h.update(repr((p.pid, p.arrival_time, p.burst_time, p.period, p.deadline)).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def options_key(scheduler, options):
+    # options of the call with the defaults of the scheduler filled in, so rr(l) and rr(l, quantum=4) share an entry.
+    # instrument doesn't change the schedule, and the instrumented runs are never cached
+    try:
+        bound = inspect.signature(scheduler).bind_partial(**options)
+        bound.apply_defaults()
+        options = {k: v for k, v in bound.arguments.items() if k not in ("processes", "instrument")}
+    except (TypeError, ValueError):
+        pass
+    return tuple(sorted(options.items()))
+
+def result_size(result):
+    # approximate memory used by a ScheduleResult, in bytes : mostly the columns of its trace
+    trace = getattr(result, 'trace', None)
+    if trace is None:
+        return sys.getsizeof(result) + 64 * (len(result[0]) + len(result[3]))
+    columns = (trace.pid, trace.kind, trace.start, trace.end)
+    return sum(c.itemsize * len(c) for c in columns) + 64 * len(trace.pids) + 512
+
+class ScheduleCache:
+    """
+    LRU cache of schedules, keyed by the fingerprint of the task set, the scheduler and its options.
+    The least recently used schedules are evicted when there are more than max_entries of them or when they
+    take more than max_bytes. The cached ScheduleResult are shared, they must not be modified.
+    With a ScheduleStore, the schedules missing from memory are looked up on disk and the new ones are stored there too.
+    If the store can't be opened or written (read-only directory, ...), a warning is shown and the cache goes on in
+    memory only.
+
+    Attributes:
+        max_entries: Maximum number of schedules kept.
+        max_bytes: Maximum memory used by the schedules kept, estimated with result_size.
+        store: ScheduleStore behind the cache, or None.
+        size: Memory used by the schedules kept.
+        hits: Number of schedules found in the cache.
+        store_hits: Number of the hits that were read from the store.
+        misses: Number of schedules that had to be computed.
+        evictions: Number of schedules evicted.
+
+    Methods:
+        key(scheduler, processes, **options): Returns the key of a schedule.
+        get(key): Returns the schedule of the key, or None.
+        put(key, result): Stores a schedule.
+        run(scheduler, processes, **options): Returns the cached schedule, or runs the scheduler and stores it.
+            A run with instrument=True is always run and not stored.
+        flush(): Writes the schedules the store keeps in memory.
+        close(): Writes them and closes the store.
+        clear(): Empties the cache.
+        stats(): Returns the counters as a dict.
+    """
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024, store=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+        self.entries = OrderedDict()    # key -> (result, size), from the least to the most recently used
+        self.size = 0
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, scheduler, processes, **options):
+        name = getattr(scheduler, '__qualname__', None) or repr(scheduler)
+        return (fingerprint(processes), name, options_key(scheduler, options))
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        result = None
+        if self.store is not None:
+            try:
+                result = self.store.get(key)
+            except (sqlite3.Error, OSError) as e:
+                self._drop_store(e)
+        if result is None:
+            self.misses += 1
+            return None
+        self._keep(key, result)
+        self.hits += 1
+        self.store_hits += 1
+        return result
+
+    def put(self, key, result):
+        self._keep(key, result)
+        if self.store is not None:
+            try:
+                self.store.put(key, result)
+            except (sqlite3.Error, OSError) as e:
+                self._drop_store(e)
+
+    def flush(self):
+        if self.store is not None:
+            try:
+                self.store.flush()
+            except (sqlite3.Error, OSError) as e:
+                self._drop_store(e)
+
+    def close(self):
+        self.flush()
+        if self.store is not None:
+            self.store.close()
+
+    def _drop_store(self, error):
+        # the schedules not written yet stay in memory like the others
+        warnings.warn(f"schedule store {self.store.path} unavailable ({error}), schedules are only kept in memory",
+                      RuntimeWarning, stacklevel=3)
+        self.store = None
+
+    def _keep(self, key, result):
+        size = result_size(result)
+        if size > self.max_bytes:       # would evict everything else and still not fit
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.entries[key] = (result, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def run(self, scheduler, processes, **options):
+        if options.get('instrument'):           # the counters and timings are the ones of this run
+            return scheduler(processes, **options)
+        key = self.key(scheduler, processes, **options)
+        result = self.get(key)
+        if result is None:
+            result = scheduler(processes, **options)
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.size, 'hits': self.hits, 'store_hits': self.store_hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    def __len__(self):
+        return len(self.entries)
+
+# cache shared by the windows of the game, kept on disk between two launches of main.py
+default_cache = ScheduleCache(store=ScheduleStore())
+atexit.register(default_cache.close)
@@ -0,0 +1,203 @@
+import numpy as np
+
+from schedule_trace import RUN, ARRIVE, REQUEUE, DISPATCH, PREEMPT, DROP
+
+# columns of ScheduleMetrics.tasks, one value per task
+TASK_COLUMNS = ["pid", "jobs", "completed", "dropped", "waiting_time", "turnaround_time", "response_time",
+                "max_response_time", "max_lateness", "deadline_misses", "preemptions", "requeues",
+                "start_jitter", "finish_jitter"]
+
+class ScheduleMetrics:
+    """
+    Metrics of a schedule computed from its trace, see trace_metrics.
+    A job is one release of a task (one ARRIVE row) : every job of a non periodic process, every period of a
+    periodic task. Times are measured from the release, the time the job entered the ready queue.
+    The means are over the completed jobs, the jobs still pending at the end of the trace are only counted in jobs.
+
+    Attributes:
+        jobs: Number of jobs released.
+        completed: Number of jobs completed.
+        dropped: Number of jobs dropped at their deadline (EDF).
+        waiting_time: Mean time spent in the ready queue, turnaround_time - execution time.
+        turnaround_time: Mean time from release to completion, what the schedulers return as performances.
+        response_time: Mean time from release to the first time on the cpu.
+        max_lateness: Largest completion - absolute deadline, negative if every job is early (None without deadlines).
+        deadline_misses: Jobs completed after their deadline or dropped (None without deadlines).
+        busy_time: Time the cpu spent running jobs.
+        span: End of the period the utilization is computed on.
+        utilization: busy_time / span.
+        makespan: Time of the last completion.
+        context_switches: Dispatches of another task than the one dispatched before.
+        preemptions: Jobs that left the cpu for a job with a higher priority (RM, EDF).
+        requeues: Jobs that went back to the ready queue at the end of a quantum (RR).
+        tasks: {column: NumPy array} of the per-task values, see TASK_COLUMNS. start_jitter and finish_jitter are
+            the spread (max - min) of the response and turnaround times of the jobs of a periodic task.
+
+    Methods:
+        as_dict(): Returns the schedule-wide metrics as a flat dict.
+        task_rows(): Returns one dict per task with the TASK_COLUMNS values.
+    """
+    SUMMARY = ["jobs", "completed", "dropped", "waiting_time", "turnaround_time", "response_time", "max_lateness",
+               "deadline_misses", "busy_time", "span", "utilization", "makespan", "context_switches", "preemptions",
+               "requeues"]
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.SUMMARY}
+
+    def task_rows(self):
+        columns = [self.tasks[name].tolist() if name != "pid" else self.tasks[name] for name in TASK_COLUMNS]
+        return [dict(zip(TASK_COLUMNS, row)) for row in zip(*columns)]
+
+    def __repr__(self):
+        return f"ScheduleMetrics({self.as_dict()})"
+
+def _mean(total, count):
+    return total / count if count else 0.0
+
+def _jobs(kind, pid, start):
+    """
+    Job of every row of a trace, numbered in release order (-1 for the rows without a job).
+    A job is a task and a release : ARRIVE rows start at the release, DISPATCH and DROP rows carry the release
+    of the job taken from the ready queue in their start, and a RUN row is a slice of the job of the last DISPATCH.
+    Returns the job of every row, and the ARRIVE row of every job.
+    """
+    n = len(kind)
+    index = np.arange(n)
+    keyed = np.flatnonzero((kind == ARRIVE) | (kind == DISPATCH) | (kind == DROP))
+    order = keyed[np.lexsort((kind[keyed] != ARRIVE, start[keyed], pid[keyed]))]  # by task, release, ARRIVE first
+    first = np.r_[True, (pid[order][1:] != pid[order][:-1]) | (start[order][1:] != start[order][:-1])]
+    released = order[first]
+    number = np.argsort(released)                           # the jobs in the order of their ARRIVE rows
+    rank = np.empty_like(number)
+    rank[number] = np.arange(len(number))
+
+    job = np.full(n, -1, dtype=np.int64)
+    job[order] = rank[np.cumsum(first) - 1]
+    last_dispatch = np.maximum.accumulate(np.where(kind == DISPATCH, index, -1)) if n > 0 else index
+    slices = np.flatnonzero((kind == RUN) & (last_dispatch >= 0))
+    job[slices] = job[last_dispatch[slices]]
+    return job, np.sort(released)
+
+def trace_metrics(trace, deadlines=None, span=None):
+    """
+    Every metric of a schedule in one pass over the columns of its trace, with NumPy : no Python loop over the
+    rows and no list of ticks, so it works on traces of millions of rows.
+    The events of the trace are matched to their jobs by task and release (see _jobs).
+
+    Args:
+        trace: Trace of the schedule.
+        deadlines: {pid: relative deadline}, or None to skip the lateness and the deadline misses.
+        span: End of the schedule for the utilization, the end of the last event by default.
+
+    Returns:
+        ScheduleMetrics.
+    """
+    columns = trace.columns()
+    kind, pid, start, end = columns['kind'], columns['pid'].astype(np.int64), columns['start'], columns['end']
+    n_tasks = len(trace.pids)
+    job, released = _jobs(kind, pid, start)
+    n_jobs = len(released)
+    job_task = pid[released]
+    release = start[released]
+
+    # a RUN row ends its job unless the job goes back to the ready queue right after (PREEMPT / REQUEUE row)
+    following = np.r_[kind[1:], ARRIVE] if len(kind) > 0 else kind
+    run = kind == RUN
+    slices = np.flatnonzero(run)
+    completions = np.flatnonzero(run & (following != PREEMPT) & (following != REQUEUE))
+    drops = np.flatnonzero(kind == DROP)
+
+    slice_job = job[slices]
+    executed = np.bincount(slice_job, weights=end[slices] - start[slices], minlength=n_jobs)
+    first_slice = np.full(n_jobs, -1, dtype=np.int64)
+    first_jobs, first = np.unique(slice_job, return_index=True)    # slices in trace order, the first one is the earliest
+    first_slice[first_jobs] = start[slices[first]]
+
+    finished = np.zeros(n_jobs, dtype=bool)                 # completed
+    was_dropped = np.zeros(n_jobs, dtype=bool)
+    finish = np.zeros(n_jobs, dtype=end.dtype)
+    finished[job[completions]] = True
+    finish[job[completions]] = end[completions]
+    was_dropped[job[drops]] = True
+    finish[job[drops]] = end[drops]
+
+    turnaround = (finish - release)[finished]
+    waiting = turnaround - executed[finished]
+    started = first_slice >= 0
+    response = (first_slice - release)[started]
+    done_task = job_task[finished]
+    started_task = job_task[started]
+
+    lateness = missed = None
+    if deadlines is not None:
+        relative = np.array([deadlines[p] for p in trace.pids], dtype=np.float64)
+        late = finish - (release + relative[job_task])
+        lateness = late[finished]
+        missed = (finished & (late > 0)) | was_dropped
+
+    # per task
+    completed_per_task = np.bincount(done_task, minlength=n_tasks)
+    started_per_task = np.bincount(started_task, minlength=n_tasks)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tasks = {
+            "pid": list(trace.pids),
+            "jobs": np.bincount(job_task, minlength=n_tasks),
+            "completed": completed_per_task,
+            "dropped": np.bincount(job_task[was_dropped], minlength=n_tasks),
+            "waiting_time": np.bincount(done_task, weights=waiting, minlength=n_tasks) / completed_per_task,
+            "turnaround_time": np.bincount(done_task, weights=turnaround, minlength=n_tasks) / completed_per_task,
+            "response_time": np.bincount(started_task, weights=response, minlength=n_tasks) / started_per_task,
+            "max_response_time": _reduce(np.maximum, started_task, response, n_tasks),
+            "max_lateness": _reduce(np.maximum, done_task, lateness, n_tasks) if lateness is not None else None,
+            "deadline_misses": np.bincount(job_task[missed], minlength=n_tasks) if missed is not None else None,
+            "preemptions": np.bincount(pid[kind == PREEMPT], minlength=n_tasks),
+            "requeues": np.bincount(pid[kind == REQUEUE], minlength=n_tasks),
+            "start_jitter": _reduce(np.maximum, started_task, response, n_tasks)
+                            - _reduce(np.minimum, started_task, response, n_tasks),
+            "finish_jitter": _reduce(np.maximum, done_task, turnaround, n_tasks)
+                             - _reduce(np.minimum, done_task, turnaround, n_tasks),
+        }
+
+    dispatched = pid[kind == DISPATCH]
+    busy_time = (end[slices] - start[slices]).sum().item()
+    last = end.max().item() if len(end) > 0 else 0
+    span = last if span is None else span
+    return ScheduleMetrics(
+        jobs=n_jobs,
+        completed=len(turnaround),
+        dropped=int(was_dropped.sum()),
+        waiting_time=_mean(waiting.sum().item(), len(waiting)),
+        turnaround_time=_mean(turnaround.sum().item(), len(turnaround)),
+        response_time=_mean(response.sum().item(), len(response)),
+        max_lateness=lateness.max().item() if lateness is not None and len(lateness) > 0 else None,
+        deadline_misses=int(missed.sum()) if missed is not None else None,
+        busy_time=busy_time,
+        span=span,
+        utilization=busy_time / span if span else 0.0,
+        makespan=finish[finished].max().item() if finished.any() else 0,
+        context_switches=int(np.count_nonzero(dispatched[1:] != dispatched[:-1])),
+        preemptions=int(np.count_nonzero(kind == PREEMPT)),
+        requeues=int(np.count_nonzero(kind == REQUEUE)),
+        tasks=tasks,
+    )
+
+def _reduce(ufunc, groups, values, n):
+    # ufunc (np.maximum / np.minimum) of the values of each group, NaN for the groups without value
+    out = np.full(n, -np.inf if ufunc is np.maximum else np.inf)
+    ufunc.at(out, groups, values)
+    out[np.isinf(out)] = np.nan
+    return out
+
+def schedule_metrics(result, processes=None):
+    """
+    trace_metrics of a ScheduleResult, with the deadlines of the processes it was computed from.
+    With a steady state (RM, EDF), the trace stops after the first repeated hyperperiod : the metrics cover the
+    simulated part only, up to steady_state + hyperperiod.
+    """
+    deadlines = None if processes is None else {p.pid: p.deadline for p in processes}
+    steady_state = getattr(result, 'steady_state', None)
+    span = result[1] if steady_state is None else steady_state + result.hyperperiod
+    return trace_metrics(result.trace, deadlines, span)
@@ -0,0 +1,119 @@
+import time
+import numpy as np
+
+from schedule_trace import RUN, ARRIVE, REQUEUE, DISPATCH, PREEMPT, DROP
+
+# phases of an iteration of the event loops, timed by EngineStats.lap
+ADMISSION = "admission"     # arrivals and releases entering the ready queue
+DISPATCH_PHASE = "dispatch" # the cpu takes a process from the ready queue (and EDF drops the expired jobs)
+COMPLETION = "completion"   # the process leaves the cpu : completed, preempted or at the end of its quantum
+ADVANCE = "advance"         # jump to the next event
+PHASES = (ADMISSION, DISPATCH_PHASE, COMPLETION, ADVANCE)
+
+class EngineStats:
+    """
+    Counters and timings of one run of a scheduler called with instrument=True, available as result.stats.
+    The event counts and busy / idle times come from the trace, so they cover the whole schedule, also the part
+    a resumed run (process.reschedule) took from the previous one. The other counters and the timings only cover
+    the iterations run by this call. With a steady state (RM, EDF), only the simulated hyperperiods are counted.
+
+    Attributes:
+        iterations: Number of iterations of the event loop, 0 for the vectorized FCFS / SJN.
+        pushes: Number of insertions in the ready queue.
+        pops: Number of processes taken out of the ready queue, the jobs dropped by EDF included.
+        peak_queue: Maximum length of the ready queue.
+        arrivals, dispatches, preemptions, requeues, drops, completions: Number of events of each kind. Every
+            dispatch is a context switch, requeues are the ends of RR quanta.
+        busy_time: Time the cpu spent running processes.
+        idle_time: Time the cpu spent idle between 0 and span.
+        span: Time the simulation went up to.
+        seconds: {phase: seconds} spent in each phase of PHASES.
+        total_seconds: Wall time of the run, the time spent by the reader of stream_schedule included.
+
+    Methods:
+        lap(phase, start): Adds the time since start to the phase and returns the current time.
+        stop(span): Ends the run at span, sets idle_time and total_seconds.
+        count_trace(trace, span): Sets the event counts and busy / idle times from a trace and ends the run.
+        count_events(events): Adds a batch of events to the event counts and busy time.
+        queue_from_trace(trace): Sets the ready queue counters from the events of a trace.
+        as_dict(): Returns every counter and timing as a flat dict.
+    """
+    def __init__(self):
+        self.iterations = 0
+        self.pushes = 0
+        self.pops = 0
+        self.peak_queue = 0
+        self.arrivals = 0
+        self.dispatches = 0
+        self.preemptions = 0
+        self.requeues = 0
+        self.drops = 0
+        self.completions = 0
+        self.busy_time = 0
+        self.idle_time = 0
+        self.span = 0
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.total_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def lap(self, phase, start):
+        now = time.perf_counter()
+        self.seconds[phase] += now - start
+        return now
+
+    def stop(self, span):
+        self.span = span
+        self.idle_time = span - self.busy_time
+        self.total_seconds = time.perf_counter() - self.started
+
+    def count_trace(self, trace, span):
+        columns = trace.columns()
+        counts = np.bincount(columns['kind'], minlength=DROP + 1)
+        self.arrivals = int(counts[ARRIVE])
+        self.dispatches = int(counts[DISPATCH])
+        self.preemptions = int(counts[PREEMPT])
+        self.requeues = int(counts[REQUEUE])
+        self.drops = int(counts[DROP])
+        self.completions = int(counts[RUN]) - self.preemptions - self.requeues  # the other slices end the process
+        runs = trace.rows_of_kind(RUN)
+        self.busy_time = int((columns['end'][runs] - columns['start'][runs]).sum())
+        self.stop(span)
+
+    def count_events(self, events):
+        # events : (kind, pid, start, end) rows of a streamed run, given in batches as they are recorded
+        for kind, _, start, end in events:
+            if kind == RUN:
+                self.busy_time += end - start
+                self.completions += 1
+            elif kind == ARRIVE:
+                self.arrivals += 1
+            elif kind == DISPATCH:
+                self.dispatches += 1
+            elif kind == PREEMPT:
+                self.preemptions += 1
+                self.completions -= 1   # the RUN row just before was a preemption, not a completion
+            elif kind == REQUEUE:
+                self.requeues += 1
+                self.completions -= 1
+            elif kind == DROP:
+                self.drops += 1
+
+    def queue_from_trace(self, trace):
+        # ready queue counters of a run without ready queue (vectorized FCFS / SJN), rebuilt from its events
+        kind = trace.columns()['kind']
+        delta = np.isin(kind, (ARRIVE, PREEMPT, REQUEUE)).astype(np.int64) - np.isin(kind, (DISPATCH, DROP))
+        self.pushes = int(np.count_nonzero(delta > 0))
+        self.pops = int(np.count_nonzero(delta < 0))
+        self.peak_queue = int(np.cumsum(delta).max()) if len(delta) > 0 else 0
+
+    def as_dict(self):
+        flat = {name: getattr(self, name) for name in
+                ("iterations", "pushes", "pops", "peak_queue", "arrivals", "dispatches", "preemptions", "requeues",
+                 "drops", "completions", "busy_time", "idle_time", "span", "total_seconds")}
+        for phase in PHASES:
+            flat[phase + "_seconds"] = self.seconds[phase]
+        flat["other_seconds"] = max(0.0, self.total_seconds - sum(self.seconds.values()))
+        return flat
+
+    def __repr__(self):
+        return f"EngineStats({self.as_dict()})"
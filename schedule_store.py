@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+import sys
+import numpy as np
+
+from process import ENGINE_VERSION, ScheduleResult
+from schedule_trace import Trace
+
+def user_cache_dir(name="master_of_scheduling"):
+    # cache directory of the current user, the directory of the code may be read-only (shared installs)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, name)
+
+DEFAULT_PATH = os.path.join(user_cache_dir(), "schedules.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    fingerprint TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    options TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    time,
+    performances,
+    info TEXT NOT NULL,
+    pids TEXT NOT NULL,
+    pid BLOB NOT NULL,
+    kind BLOB NOT NULL,
+    start BLOB NOT NULL,
+    end BLOB NOT NULL,
+    PRIMARY KEY (fingerprint, algorithm, options, version)
+) WITHOUT ROWID
+"""
+
+def _plain(value):
+    # NumPy scalars (vectorized FCFS / SJN) to Python numbers, for SQLite and JSON.
+    # SQLite integers have 64 bits : a longer one (hyperperiod of many coprime periods) raises OverflowError
+    value = value.item() if isinstance(value, np.generic) else value
+    if isinstance(value, int) and not -2**63 <= value < 2**63:
+        raise OverflowError(f"integer of {value.bit_length()} bits")
+    return value
+
+class ScheduleStore:
+    """
+    Persistent store of schedules in an SQLite file, shared by the game and the batch runs.
+    A schedule is stored with its trace columns as blobs and its metrics, under the key of ScheduleCache.key
+    (fingerprint of the task set, scheduler, options) and the ENGINE_VERSION of process.py.
+    Schedules stored by another version of the engine are never returned.
+    The writes are kept in memory and written in one transaction every batch_size schedules, or by flush().
+    A schedule with an integer SQLite can't hold (time or hyperperiod of 64 bits or more) is not written.
+    Several processes can use the same file : it is opened in WAL mode and waits for the other writers.
+    The file is opened on first use, in DEFAULT_PATH (cache directory of the user) unless another path is given,
+    and its directory is created if needed. sqlite3.Error or OSError is raised if it can't be opened or written.
+
+    Attributes:
+        path: Path of the SQLite file.
+        batch_size: Number of schedules kept in memory before they are written.
+        pending: {key: result} of the schedules not written yet.
+
+    Methods:
+        get(key): Returns the stored ScheduleResult of the key, or None.
+        put(key, result): Stores a schedule.
+        flush(): Writes the pending schedules.
+        purge(): Deletes the schedules of the other engine versions.
+        close(): Writes the pending schedules and closes the file.
+    """
+    def __init__(self, path=DEFAULT_PATH, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = {}
+        self.connection = None      # opened on first use
+
+    def connect(self):
+        if self.connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(SCHEMA)
+            self.connection.commit()
+        return self.connection
+
+    def get(self, key):
+        if key in self.pending:
+            return self.pending[key]
+        fingerprint, algorithm, options = key
+        row = self.connect().execute(
+            "SELECT time, performances, info, pids, pid, kind, start, end FROM schedules "
+            "WHERE fingerprint = ? AND algorithm = ? AND options = ? AND version = ?",
+            (fingerprint, algorithm, repr(options), ENGINE_VERSION)).fetchone()
+        if row is None:
+            return None
+        time, performances, info, pids, pid, kind, start, end = row
+        trace = Trace.from_columns(json.loads(pids),
+                                   np.frombuffer(pid, dtype='I'), np.frombuffer(kind, dtype='B'),
+                                   np.frombuffer(start, dtype='q'), np.frombuffer(end, dtype='q'))
+        return ScheduleResult(trace.results(), time, performances, trace.ready_list(), trace=trace,
+                              **json.loads(info))
+
+    def put(self, key, result):
+        self.pending[key] = result
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def _row(self, key, result):
+        fingerprint, algorithm, options = key
+        trace = result.trace
+        info = {k: _plain(v) for k, v in vars(result).items() if k not in ('trace', 'checkpoints', 'stats')}
+        return (fingerprint, algorithm, repr(options), ENGINE_VERSION, _plain(result[1]), _plain(result[2]),
+                json.dumps(info), json.dumps(trace.pids),
+                trace.pid.tobytes(), trace.kind.tobytes(), trace.start.tobytes(), trace.end.tobytes())
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows = []
+        for key, result in self.pending.items():
+            try:
+                rows.append(self._row(key, result))
+            except OverflowError:
+                pass        # only kept in memory, by the ScheduleCache
+        connection = self.connect()
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO schedules VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.pending.clear()
+
+    def purge(self):
+        connection = self.connect()
+        with connection:
+            connection.execute("DELETE FROM schedules WHERE version != ?", (ENGINE_VERSION,))
+
+    def close(self):
+        self.flush()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,147 @@
+import array
+from collections import namedtuple
+import numpy as np
+
+# kind of a row of the trace
+RUN = 0         # the process ran on the cpu from start to end                      results    : [pid, start, end]
+ARRIVE = 1      # the process entered the ready queue at start                      ready_list : [pid, time, -10]
+REQUEUE = 2     # the process went back to the ready queue at the end of its quantum  ready_list : [pid, time, -10]
+DISPATCH = 3    # the process left the ready queue for the cpu at end                ready_list : [pid, -10, time]
+PREEMPT = 4     # the process left the cpu for a process with a higher priority      ready_list : [pid, -10, time]
+DROP = 5        # the job reached its deadline and was erased from the ready queue    ready_list : [pid, -10, time]
+# The events of one instant have start == end, except DISPATCH and DROP : their start is the release of the job
+# (the start of its ARRIVE row), so (pid, start) tells which job of a periodic task leaves the ready queue
+
+KIND_NAMES = ["run", "arrive", "requeue", "dispatch", "preempt", "drop"]
+
+# one row of a trace, as yielded by process.stream_schedule
+Event = namedtuple("Event", ["kind", "pid", "start", "end"])
+
+class Trace:
+    """
+    Columnar record of a schedule, one row per event, stored in typed arrays instead of one Python list per event.
+
+    Attributes:
+        pids: Every pid seen in the schedule, once. The rows refer to it by index.
+        pid: Column of pid indexes (unsigned 32 bits).
+        kind: Column of event kinds (RUN, ARRIVE, ...) (unsigned 8 bits).
+        start: Column of start times (signed 64 bits).
+        end: Column of end times (signed 64 bits), the time of the events that happen at one instant.
+
+    Methods:
+        from_columns(pids, pid, kind, start, end): Builds a trace from whole columns.
+        add(kind, pid, start, end): Appends a row.
+        head(length): Returns a new trace with the first length rows.
+        columns(): Returns zero-copy NumPy views of the columns.
+        results(): Returns the RUN rows as [pid, start, end] lists.
+        ready_list(): Returns the other rows as [pid, time, -10] / [pid, -10, time] lists.
+    """
+    def __init__(self):
+        self.pids = []
+        self.pid_index = {}
+        self.pid = array.array('I')
+        self.kind = array.array('B')
+        self.start = array.array('q')
+        self.end = array.array('q')
+
+    @classmethod
+    def from_columns(cls, pids, pid, kind, start, end):
+        # builds a trace from whole columns (sequences or NumPy arrays) at once
+        # pids : the pid table, or a dict {pid: index} already built by the caller
+        trace = cls()
+        trace.pids = list(pids)
+        trace.pid_index = pids if isinstance(pids, dict) else {p: i for i, p in enumerate(trace.pids)}
+        for column, values in ((trace.pid, pid), (trace.kind, kind), (trace.start, start), (trace.end, end)):
+            column.frombytes(np.asarray(values, dtype=column.typecode).tobytes())
+        return trace
+
+    def add(self, kind, pid, start, end):
+        index = self.pid_index.get(pid)
+        if index is None:
+            index = len(self.pids)
+            self.pid_index[pid] = index
+            self.pids.append(pid)
+        self.pid.append(index)
+        self.kind.append(kind)
+        self.start.append(start)
+        self.end.append(end)
+
+    def head(self, length):
+        # new trace with the first length rows, to go on with another schedule that starts the same way
+        trace = Trace()
+        trace.pid = self.pid[:length]
+        trace.kind = self.kind[:length]
+        trace.start = self.start[:length]
+        trace.end = self.end[:length]
+        # pids are numbered in order of appearance, so the pids of the first rows are the first ones of the table
+        count = max(trace.pid) + 1 if length > 0 else 0
+        trace.pids = self.pids[:count]
+        trace.pid_index = {p: i for i, p in enumerate(trace.pids)}
+        return trace
+
+    def __len__(self):
+        return len(self.kind)
+
+    def columns(self):
+        # the arrays can't grow while these views are alive, so only call it once the schedule is done
+        return {
+            'pid': np.frombuffer(self.pid, dtype=self.pid.typecode),
+            'kind': np.frombuffer(self.kind, dtype=self.kind.typecode),
+            'start': np.frombuffer(self.start, dtype=self.start.typecode),
+            'end': np.frombuffer(self.end, dtype=self.end.typecode),
+        }
+
+    def rows_of_kind(self, *kinds):
+        # indexes of the rows of the given kinds, in order
+        return np.flatnonzero(np.isin(np.frombuffer(self.kind, dtype=self.kind.typecode), kinds))
+
+    def row(self, i):
+        # row i in the legacy list format
+        pid = self.pids[self.pid[i]]
+        kind = self.kind[i]
+        if kind == RUN:
+            return [pid, self.start[i], self.end[i]]
+        if kind == ARRIVE or kind == REQUEUE:
+            return [pid, self.start[i], -10]
+        return [pid, -10, self.end[i]]
+
+    def results(self):
+        return TraceRows(self, self.rows_of_kind(RUN))
+
+    def ready_list(self):
+        return TraceRows(self, self.rows_of_kind(ARRIVE, REQUEUE, DISPATCH, PREEMPT, DROP))
+
+class EventBuffer(list):
+    """
+    Events an engine recorded since they were last read, as (kind, pid, start, end) tuples.
+    Engines use it instead of a Trace to stream their events.
+    """
+    def add(self, kind, pid, start, end):
+        self.append((kind, pid, start, end))
+
+class TraceRows:
+    """
+    Read-only sequence of some rows of a Trace, in the list format the schedulers used to return.
+    The small lists are only built when a row is read.
+    """
+    def __init__(self, trace, rows):
+        self.trace = trace
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.trace.row(int(j)) for j in self.rows[i]]
+        return self.trace.row(int(self.rows[i]))
+
+    def __iter__(self):
+        for j in self.rows:
+            yield self.trace.row(int(j))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
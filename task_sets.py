@@ -0,0 +1,47 @@
+import process as pro
+from process import Process
+
+# parameters of the generated task sets, as set on Thread by Thread.adjust_to_difficulty
+DEFAULT_PARAMETERS = dict(min_thread=3, max_thread=20,
+                          min_arrival_time=0, max_arrival_time=30,
+                          min_burst_time=1, max_burst_time=8,
+                          min_period=0, max_period=15)
+
+DIFFICULTY_LEVELS = {
+    1: dict(min_thread=3, max_thread=5, max_arrival_time=5, max_period=0),
+    2: dict(min_thread=5, max_thread=10, max_arrival_time=10, max_period=0),
+    3: dict(min_thread=10, max_thread=15, max_arrival_time=20, max_period=5),
+    4: dict(min_thread=15, max_thread=20, max_arrival_time=30, max_period=15),
+}
+
+ALGORITHMS = {
+    "FCFS": pro.fcfs_scheduling,
+    "SJN": pro.sjn_scheduling,
+    "RR": pro.rr_scheduling,
+    "RM": pro.rm_scheduling,
+    "EDF": pro.edf_scheduling,
+}
+
+def level_parameters(difficulty=None, **overrides):
+    # parameters of a difficulty level, with some of them replaced
+    parameters = dict(DEFAULT_PARAMETERS)
+    if difficulty is not None:
+        parameters.update(DIFFICULTY_LEVELS[difficulty])
+    parameters.update(overrides)
+    return parameters
+
+def generate_tasks(rng, parameters):
+    # random task set, drawn the same way as Thread.create_thread : a list of dicts
+    tasks = []
+    number_of_process = rng.randint(parameters['min_thread'], parameters['max_thread'])
+    for i in range(number_of_process):
+        burst_time = rng.randint(parameters['min_burst_time'], parameters['max_burst_time'])
+        tasks.append(dict(name="L" + str(i),
+                          arrival_time=rng.randint(parameters['min_arrival_time'], parameters['max_arrival_time']),
+                          burst_time=burst_time,
+                          period=rng.randint(parameters['min_period'], parameters['max_period']),
+                          deadline=2 * burst_time))
+    return tasks
+
+def to_processes(tasks):
+    return [Process(t['name'], t['arrival_time'], t['burst_time'], t['period'], t['deadline']) for t in tasks]
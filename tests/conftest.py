@@ -0,0 +1,6 @@
+import os
+import sys
+
+# the modules of the game are at the root of the repository, the reference engines next to the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,220 @@
+import math
+import pickle
+import random
+
+import pytest
+
+import process as pro
+import tick_engines
+from schedule_metrics import schedule_metrics
+from schedule_trace import RUN, ARRIVE, REQUEUE, DISPATCH, PREEMPT, DROP
+from task_sets import generate_tasks, level_parameters, to_processes
+
+SCHEDULERS = ["fcfs_scheduling", "sjn_scheduling", "rr_scheduling", "rm_scheduling", "edf_scheduling"]
+
+def random_tasks(rng, n_max=6, max_period=12):
+    # (pid, arrival_time, burst_time, period, deadline), with the default period and deadline now and then
+    tasks = []
+    for i in range(rng.randint(1, n_max)):
+        burst_time = rng.randint(1, 6)
+        tasks.append((f"T{i}", rng.randint(0, 20), burst_time,
+                      rng.choice([None, 0, rng.randint(2, max_period)]),
+                      rng.choice([None, 0, rng.randint(1, 15)])))
+    return tasks
+
+def build(module, tasks):
+    return [module.Process(*task) for task in tasks]
+
+def as_lists(result):
+    results, time, performances, ready_list = result
+    return [list(row) for row in results], int(time), performances, [list(row) for row in ready_list]
+
+def same_schedule(a, b):
+    return as_lists(a) == as_lists(b) and a.deadline_misses == b.deadline_misses
+
+# schedules of the examples of process.py, as computed by the tick engines
+EXAMPLE = [(1, 1, 5), (2, 1, 3), (3, 2, 8)]
+PERIODIC_EXAMPLE = [(1, 0, 1, 4), (2, 0, 2, 5), (3, 0, 3, 10)]
+EXPECTED = {
+    "fcfs_scheduling": (EXAMPLE, [[1, 1, 6], [2, 6, 9], [3, 9, 17]], 17, 9.333333333333334,
+                        [[1, 1, -10], [2, 1, -10], [1, -10, 1], [3, 2, -10], [2, -10, 6], [3, -10, 9]]),
+    "sjn_scheduling": (EXAMPLE, [[2, 1, 4], [1, 4, 9], [3, 9, 17]], 17, 8.666666666666666,
+                       [[1, 1, -10], [2, 1, -10], [2, -10, 1], [3, 2, -10], [1, -10, 4], [3, -10, 9]]),
+    "rr_scheduling": (EXAMPLE, [[1, 1, 5], [2, 5, 8], [3, 8, 12], [1, 12, 13], [3, 13, 17]], 17, 11.333333333333334,
+                      [[1, 1, -10], [2, 1, -10], [1, -10, 1], [3, 2, -10], [1, 5, -10], [2, -10, 5], [3, -10, 8],
+                       [3, 12, -10], [1, -10, 12], [3, -10, 13]]),
+    "rm_scheduling": (PERIODIC_EXAMPLE,
+                      [[1, 0, 1], [2, 1, 3], [3, 3, 4], [1, 4, 5], [2, 5, 7], [3, 7, 8], [1, 8, 9], [3, 9, 10],
+                       [2, 10, 12], [1, 12, 13], [3, 13, 15], [2, 15, 16], [1, 16, 17], [2, 17, 18], [3, 18, 19]],
+                      20, 11.333333333333334,
+                      [[1, 0, -10], [2, 0, -10], [3, 0, -10], [1, -10, 0], [2, -10, 1], [3, -10, 3], [1, 4, -10],
+                       [3, -10, 4], [1, -10, 4], [2, 5, -10], [2, -10, 5], [3, -10, 7], [1, 8, -10], [3, -10, 8],
+                       [1, -10, 8], [3, -10, 9], [2, 10, -10], [3, 10, -10], [2, -10, 10], [1, 12, -10],
+                       [1, -10, 12], [3, -10, 13], [2, 15, -10], [3, -10, 15], [2, -10, 15], [1, 16, -10],
+                       [2, -10, 16], [1, -10, 16], [2, -10, 17], [3, -10, 18]]),
+}
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_fixed_example(name):
+    tasks, *expected = EXPECTED[name]
+    assert list(as_lists(getattr(pro, name)(build(pro, tasks)))) == expected
+
+def test_fixed_edf_example():
+    # the tick engine stops on this one (pop from an empty ready queue), the jobs past their deadline are dropped
+    result = pro.edf_scheduling(build(pro, [(1, 0, 3, 20, 7), (2, 0, 2, 5, 4), (3, 0, 2, 10, 8)]))
+    assert as_lists(result) == ([[2, 0, 2], [1, 2, 5], [3, 5, 7], [3, 10, 12]], 20, 5.333333333333333,
+                                [[1, 0, -10], [2, 0, -10], [3, 0, -10], [2, -10, 0], [1, -10, 2], [2, 5, -10],
+                                 [2, -10, 5], [3, -10, 5], [2, 10, -10], [3, 10, -10], [2, -10, 10], [3, -10, 10],
+                                 [2, 15, -10], [2, -10, 15]])
+    assert result.deadline_misses == 3
+
+@pytest.mark.parametrize("name", SCHEDULERS)
+def test_same_schedule_as_tick_engines(name):
+    # the task sets the tick engines fail on (empty ready queue of EDF, ...) are the ones the engines fixed
+    rng = random.Random(SCHEDULERS.index(name))
+    compared = 0
+    for _ in range(300):
+        tasks = random_tasks(rng)
+        try:
+            expected = getattr(tick_engines, name)(build(tick_engines, tasks))
+        except Exception:
+            continue
+        assert as_lists(getattr(pro, name)(build(pro, tasks))) == as_lists(expected), tasks
+        compared += 1
+    assert compared > 50
+
+@pytest.mark.parametrize("name", ["fcfs_scheduling", "sjn_scheduling"])
+def test_vectorized_matches_event_loop(name):
+    rng = random.Random(7)
+    for _ in range(100):
+        tasks = build(pro, random_tasks(rng, n_max=40))
+        scheduler = getattr(pro, name)
+        assert as_lists(scheduler(tasks, vectorized=True)) == as_lists(scheduler(tasks, vectorized=False))
+
+@pytest.mark.parametrize("name", ["fcfs_scheduling", "sjn_scheduling", "rm_scheduling", "edf_scheduling"])
+def test_reschedule_matches_full_run(name):
+    # each edit is resumed from the checkpoints of the previous schedule, and must give the schedule of a new run
+    rng = random.Random(11 + SCHEDULERS.index(name))
+    scheduler = getattr(pro, name)
+    periodic = name in ("rm_scheduling", "edf_scheduling")
+    resumed = 0
+    for _ in range(60):
+        tasks = random_tasks(rng, n_max=6 if periodic else 30)
+        options = {'horizon': rng.randint(10, 200)} if periodic and rng.random() < 0.3 else {}
+        every = rng.choice([1, 2, 4, 16])
+        previous = pro.reschedule(scheduler, build(pro, tasks), None, every, **options)
+        assert same_schedule(previous, scheduler(build(pro, tasks), **options))
+        for edit in range(3):
+            new = random_tasks(rng, n_max=1)[0]
+            edit_kind = rng.random()
+            if edit_kind < 0.4 or len(tasks) < 2:
+                tasks = tasks + [(f"N{edit}",) + new[1:]]
+            elif edit_kind < 0.8:
+                i = rng.randrange(len(tasks))
+                tasks = tasks[:i] + [(tasks[i][0],) + new[1:]] + tasks[i + 1:]
+            else:
+                i = rng.randrange(len(tasks))
+                tasks = tasks[:i] + tasks[i + 1:]
+            result = pro.reschedule(scheduler, build(pro, tasks), previous, every, **options)
+            assert same_schedule(result, scheduler(build(pro, tasks), **options)), (tasks, options, every)
+            resumed += len(result.checkpoints.states) > 0
+            previous = result
+    assert resumed > 0
+
+def brute_force_metrics(result, processes):
+    # the metrics of schedule_metrics, by walking the trace row by row
+    trace = result.trace
+    columns = trace.columns()
+    jobs, current = {}, None
+    for i in range(len(trace)):
+        kind, pid = columns['kind'][i], trace.pids[columns['pid'][i]]
+        start, end = int(columns['start'][i]), int(columns['end'][i])
+        if kind == ARRIVE:
+            jobs[(pid, start)] = dict(release=start, executed=0, first=None, finish=None, dropped=False)
+        elif kind == DISPATCH:
+            current = (pid, start)
+        elif kind == DROP:
+            jobs[(pid, start)].update(dropped=True, finish=end)
+        elif kind == RUN:
+            job = jobs[current]
+            job['executed'] += end - start
+            if job['first'] is None:
+                job['first'] = start
+            if i + 1 == len(trace) or columns['kind'][i + 1] not in (PREEMPT, REQUEUE):
+                job['finish'] = end
+    deadlines = {p.pid: p.deadline for p in processes}
+    completed = [job for job in jobs.values() if job['finish'] is not None and not job['dropped']]
+    turnaround = [job['finish'] - job['release'] for job in completed]
+    waiting = [job['finish'] - job['release'] - job['executed'] for job in completed]
+    response = [job['first'] - job['release'] for job in jobs.values() if job['first'] is not None]
+    misses = sum(1 for (pid, _), job in jobs.items()
+                 if job['dropped'] or (job['finish'] is not None and job['finish'] - job['release'] > deadlines[pid]))
+    mean = lambda values: sum(values) / len(values) if values else 0.0
+    return len(jobs), len(completed), mean(waiting), mean(turnaround), mean(response), misses
+
+@pytest.mark.parametrize("name", SCHEDULERS)
+def test_trace_metrics_match_brute_force(name):
+    rng = random.Random(5 + SCHEDULERS.index(name))
+    for _ in range(150):
+        processes = build(pro, random_tasks(rng))
+        result = getattr(pro, name)(processes)
+        metrics = schedule_metrics(result, processes)
+        computed = (metrics.jobs, metrics.completed, metrics.waiting_time, metrics.turnaround_time,
+                    metrics.response_time, metrics.deadline_misses)
+        assert computed == pytest.approx(brute_force_metrics(result, processes)), processes
+
+@pytest.mark.parametrize("name", ["fcfs_scheduling", "sjn_scheduling", "rm_scheduling", "edf_scheduling"])
+def test_resume_point_matches_reschedule(name):
+    # resumed from the part sent to a worker process, then completed : same schedule and states as from previous
+    rng = random.Random(23 + SCHEDULERS.index(name))
+    scheduler = getattr(pro, name)
+    periodic = name in ("rm_scheduling", "edf_scheduling")
+    parts = 0
+    for _ in range(60):
+        tasks = random_tasks(rng, n_max=6 if periodic else 30)
+        previous = pro.reschedule(scheduler, build(pro, tasks), None, 16)
+        i = rng.randrange(len(tasks))
+        tasks = tasks[:i] + [(tasks[i][0],) + random_tasks(rng, n_max=1)[0][1:]] + tasks[i + 1:]
+        expected = pro.reschedule(scheduler, build(pro, tasks), previous, 16)
+        part = pickle.loads(pickle.dumps(pro.resume_point(scheduler, build(pro, tasks), previous)))
+        result = pro.reschedule(scheduler, build(pro, tasks), part, 16)
+        if part is not None:
+            result.checkpoints.complete(previous.checkpoints)
+            parts += 1
+        assert same_schedule(result, expected)
+        assert result.checkpoints.states == expected.checkpoints.states
+    assert parts > 0
+
+def test_checkpoints_bounded_on_overloaded_set():
+    # difficulty 4 set far above U = 1 : the RM ready queue grows to tens of thousands of jobs,
+    # the states must not copy it every CHECKPOINT_EVERY rows
+    tasks = to_processes(generate_tasks(random.Random(3), level_parameters(4)))
+    result = pro.reschedule(pro.rm_scheduling, tasks)
+    assert sum(len(state[2]) for state in result.checkpoints.states) <= 2 * len(result.trace)
+    assert len(pickle.dumps(result.checkpoints.states)) < 4 * len(pickle.dumps(result.trace))
+    assert same_schedule(result, pro.rm_scheduling(tasks))
+
+@pytest.mark.parametrize("name", ["sjn_scheduling", "rr_scheduling", "edf_scheduling"])
+def test_reschedule_kept(name):
+    # the checkpoints stay in this process, the next call resumes from them
+    rng = random.Random(31 + SCHEDULERS.index(name))
+    scheduler = getattr(pro, name)
+    for _ in range(20):
+        tasks = random_tasks(rng)
+        for _ in range(3):
+            result = pro.reschedule_kept(scheduler, build(pro, tasks))
+            assert not hasattr(result, 'checkpoints')
+            assert same_schedule(result, scheduler(build(pro, tasks)))
+            i = rng.randrange(len(tasks))
+            tasks = tasks[:i] + [(tasks[i][0],) + random_tasks(rng, n_max=1)[0][1:]] + tasks[i + 1:]
+
+def test_hyperperiod_past_horizon():
+    # the LCM stops growing once it is past the horizon, the runs don't need it
+    periods = [7, 11, 13, 17, 19, 23]
+    tasks = [pro.Process(i, 0, 1, period) for i, period in enumerate(periods)]
+    assert pro.hyperperiod(tasks) == math.prod(periods)
+    assert pro.hyperperiod(tasks, math.prod(periods)) == math.prod(periods)
+    assert pro.hyperperiod(tasks, 1000) == math.inf
+    result = pro.rm_scheduling(tasks, horizon=1000)
+    assert result.hyperperiod == math.inf and result.horizon == 1000 and result[1] == 1000
+    assert pro.edf_scheduling(tasks[:3]).hyperperiod == 7 * 11 * 13
@@ -0,0 +1,108 @@
+import math
+import random
+
+import pytest
+
+import process as pro
+import schedulability as sc
+
+def random_periodic(rng, n_max=5, max_period=15, distinct=False, shared=None):
+    # synchronous tasks (arrival 0) with deadlines below, equal to or above the period.
+    # distinct : no two tasks with the same period, shared : periods drawn from that many values only
+    n = rng.randint(1, n_max)
+    if distinct:
+        periods = rng.sample(range(2, max_period + 1), n)
+    else:
+        values = [rng.randint(2, max_period) for _ in range(shared or n)]
+        periods = [rng.choice(values) for _ in range(n)]
+    tasks = []
+    for i, period in enumerate(periods):
+        burst_time = rng.randint(1, period)
+        deadline = rng.choice([period, rng.randint(burst_time, period), rng.randint(burst_time, 2 * period)])
+        tasks.append(pro.Process(f"T{i}", 0, burst_time, period, deadline))
+    return tasks
+
+def brute_force_demand(processes, t):
+    # execution time of the jobs released at 0, period, 2 period, ... with their deadline at most t
+    total = 0
+    for p in processes:
+        release = 0
+        while release + p.deadline <= t:
+            total += p.burst_time
+            release += p.period
+    return total
+
+def brute_force_edf(processes):
+    # EDF is feasible iff U <= 1 and the demand of every interval [0, d] fits in it, d an absolute deadline
+    # up to the hyperperiod plus the longest deadline
+    if sc.utilization(processes) > 1:
+        return False
+    limit = pro.hyperperiod(processes) + max(p.deadline for p in processes)
+    deadlines = {k * p.period + p.deadline for p in processes for k in range(limit // p.period + 1)}
+    return all(brute_force_demand(processes, d) <= d for d in deadlines if d <= limit)
+
+def rm_misses(processes):
+    # deadline misses of the simulator over a few hyperperiods, enough for the jobs past a deadline to complete
+    h = pro.hyperperiod(processes)
+    return pro.rm_scheduling(processes, horizon=3 * h + max(p.deadline for p in processes)).deadline_misses
+
+def test_liu_layland_bound():
+    assert sc.liu_layland_bound(1) == 1
+    assert sc.liu_layland_bound(2) == pytest.approx(2 * (math.sqrt(2) - 1))
+    assert sc.liu_layland_bound(1000) == pytest.approx(math.log(2), abs=1e-3)
+
+def test_demand_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(300):
+        processes = random_periodic(rng)
+        t = rng.randint(0, 100)
+        assert sc.demand(processes, t) == brute_force_demand(processes, t)
+
+def test_edf_test_matches_brute_force():
+    rng = random.Random(2)
+    verdicts = set()
+    for _ in range(2000):
+        processes = random_periodic(rng)
+        verdict = sc.edf_test(processes)
+        assert verdict.known()
+        assert bool(verdict) == brute_force_edf(processes), [(p.burst_time, p.period, p.deadline) for p in processes]
+        verdicts.add((verdict.test, verdict.verdict))
+    assert ("QPA", sc.SCHEDULABLE) in verdicts and ("QPA", sc.NOT_SCHEDULABLE) in verdicts
+
+def test_rm_test_matches_simulator():
+    # with distinct periods the priorities are strict and the analysis is exact
+    rng = random.Random(3)
+    for _ in range(2000):
+        processes = random_periodic(rng, distinct=True)
+        verdict = sc.rm_test(processes)
+        if verdict.utilization > 1:     # the jobs that never complete aren't counted by the simulator
+            assert verdict.verdict == sc.NOT_SCHEDULABLE
+            continue
+        assert bool(verdict) == (rm_misses(processes) == 0), [(p.burst_time, p.period, p.deadline) for p in processes]
+
+def test_rm_test_with_equal_periods():
+    # the simulator may run tasks of the same period in any order : a schedulable verdict never misses a deadline
+    rng = random.Random(4)
+    for _ in range(3000):
+        processes = random_periodic(rng, shared=2)
+        if sc.rm_test(processes):
+            assert rm_misses(processes) == 0, [(p.burst_time, p.period, p.deadline) for p in processes]
+
+def test_rm_test_equal_periods_example():
+    processes = [pro.Process(1, 0, 4, 13, 8), pro.Process(2, 0, 4, 13, 13), pro.Process(3, 0, 2, 6, 2)]
+    # the game showed Sched "yes" next to Miss 3
+    assert pro.rm_scheduling(processes).deadline_misses == 3
+    assert sc.rm_test(processes).verdict == sc.NOT_SCHEDULABLE
+
+def test_response_times_fixed_example():
+    # the third task ends at 10 = 3 + ceil(10 / 4) * 1 + ceil(10 / 5) * 2
+    processes = [pro.Process(1, 0, 1, 4, 4), pro.Process(2, 0, 2, 5, 5), pro.Process(3, 0, 3, 10, 10)]
+    assert sc.response_times(processes) == {1: 1, 2: 3, 3: 10}
+    assert sc.rm_test(processes).verdict == sc.SCHEDULABLE
+
+def test_check():
+    processes = [pro.Process(1, 0, 1, 4, 4), pro.Process(2, 0, 2, 5, 5)]
+    assert sc.check("FCFS", processes) is None
+    assert sc.check("EDF", []) is None
+    assert sc.check("EDF", processes).verdict == sc.SCHEDULABLE
+    assert sc.check("RM", processes + [pro.Process(3, 0, 4, 6, 6)]).verdict == sc.NOT_SCHEDULABLE
@@ -0,0 +1,90 @@
+import sqlite3
+import warnings
+
+import pytest
+
+import process as pro
+from process import TaskSet
+from schedule_cache import ScheduleCache, fingerprint, result_size
+from schedule_store import ScheduleStore
+
+TASKS = [(1, 1, 5), (2, 1, 3), (3, 2, 8)]
+
+def build(tasks):
+    return [pro.Process(*task) for task in tasks]
+
+class BrokenStore:
+    # store whose file can't be written, like a read-only cache directory
+    path = "/read-only/schedules.sqlite3"
+
+    def get(self, key):
+        return None
+
+    def put(self, key, result):
+        raise sqlite3.OperationalError("attempt to write a readonly database")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_key_of_equivalent_task_lists():
+    cache = ScheduleCache()
+    key = cache.key(pro.rr_scheduling, build(TASKS))
+    # the same parameters as Process, Task, TaskSet or with the defaults filled in give the same key
+    assert cache.key(pro.rr_scheduling, [pro.Task.make(*task) for task in TASKS]) == key
+    assert cache.key(pro.rr_scheduling, TaskSet.from_processes(build(TASKS))) == key
+    assert cache.key(pro.rr_scheduling, build(TASKS), quantum=4) == key
+    assert cache.key(pro.rr_scheduling, [pro.Process(1, -1, 5, 15, 10)] + build(TASKS[1:])) == key
+    # another scheduler, option or order of the list doesn't
+    assert cache.key(pro.rr_scheduling, build(TASKS), quantum=2) != key
+    assert cache.key(pro.fcfs_scheduling, build(TASKS)) != key
+    assert cache.key(pro.rr_scheduling, build(TASKS[::-1])) != key
+    assert fingerprint(build(TASKS)) == fingerprint(build(TASKS))
+
+def test_run_hits_and_misses():
+    cache = ScheduleCache()
+    first = cache.run(pro.sjn_scheduling, build(TASKS))
+    assert cache.run(pro.sjn_scheduling, build(TASKS)) is first
+    assert cache.run(pro.sjn_scheduling, build(TASKS), instrument=True) is not first
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+def test_lru_eviction_by_entries():
+    cache = ScheduleCache(max_entries=2)
+    results = [cache.run(pro.fcfs_scheduling, build(TASKS[:n])) for n in (1, 2)]
+    assert cache.run(pro.fcfs_scheduling, build(TASKS[:1])) is results[0]     # now the most recently used
+    cache.run(pro.fcfs_scheduling, build(TASKS))
+    assert cache.evictions == 1
+    assert cache.get(cache.key(pro.fcfs_scheduling, build(TASKS[:2]))) is None
+    assert cache.get(cache.key(pro.fcfs_scheduling, build(TASKS[:1]))) is results[0]
+
+def test_lru_eviction_by_bytes():
+    result = pro.fcfs_scheduling(build(TASKS))
+    cache = ScheduleCache(max_bytes=2 * result_size(result))
+    for i in range(5):
+        cache.put(("key", i), result)
+        assert cache.size <= cache.max_bytes
+    assert len(cache) == 2 and cache.evictions == 3
+    assert list(cache.entries) == [("key", 3), ("key", 4)]
+    small = ScheduleCache(max_bytes=result_size(result) - 1)
+    small.put(("key", 0), result)                               # larger than the whole cache, not kept
+    assert len(small) == 0 and small.evictions == 0
+
+def test_store_fallback():
+    cache = ScheduleCache(store=BrokenStore())
+    with pytest.warns(RuntimeWarning, match="only kept in memory"):
+        result = cache.run(pro.fcfs_scheduling, build(TASKS))
+    assert cache.store is None
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")                          # warned only once
+        assert cache.run(pro.fcfs_scheduling, build(TASKS)) is result
+        cache.close()
+
+def test_store_that_cannot_be_opened(tmp_path):
+    (tmp_path / "file").write_text("")
+    cache = ScheduleCache(store=ScheduleStore(str(tmp_path / "file" / "schedules.sqlite3")))
+    with pytest.warns(RuntimeWarning):
+        assert cache.get(cache.key(pro.fcfs_scheduling, build(TASKS))) is None
+    assert cache.store is None
+    assert cache.run(pro.fcfs_scheduling, build(TASKS)) is cache.run(pro.fcfs_scheduling, build(TASKS))
@@ -0,0 +1,61 @@
+import process as pro
+import schedule_store
+from schedule_cache import ScheduleCache
+from schedule_store import ScheduleStore
+
+TASKS = [(1, 0, 1, 4), (2, 0, 2, 5), (3, 0, 3, 10)]
+
+def build(tasks):
+    return [pro.Process(*task) for task in tasks]
+
+def same_result(a, b):
+    return ([list(row) for row in a[0]], a[1], a[2], [list(row) for row in a[3]]) == \
+        ([list(row) for row in b[0]], b[1], b[2], [list(row) for row in b[3]])
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "schedules.sqlite3")      # the directory is created
+    cache = ScheduleCache()
+    keys = {}
+    with ScheduleStore(path) as store:
+        for scheduler in (pro.fcfs_scheduling, pro.rm_scheduling, pro.edf_scheduling):
+            result = scheduler(build(TASKS))
+            keys[scheduler] = cache.key(scheduler, build(TASKS))
+            store.put(keys[scheduler], result)
+            assert store.get(keys[scheduler]) is result         # still pending
+    with ScheduleStore(path) as store:
+        for scheduler, key in keys.items():
+            stored, expected = store.get(key), scheduler(build(TASKS))
+            assert same_result(stored, expected)
+            assert stored.deadline_misses == expected.deadline_misses
+            assert getattr(stored, 'hyperperiod', None) == getattr(expected, 'hyperperiod', None)
+        assert store.get(cache.key(pro.sjn_scheduling, build(TASKS))) is None
+
+def test_other_engine_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "schedules.sqlite3")
+    key = ScheduleCache().key(pro.rm_scheduling, build(TASKS))
+    with ScheduleStore(path) as store:
+        store.put(key, pro.rm_scheduling(build(TASKS)))
+    monkeypatch.setattr(schedule_store, "ENGINE_VERSION", pro.ENGINE_VERSION + 1)
+    with ScheduleStore(path) as store:
+        assert store.get(key) is None
+        store.purge()
+    monkeypatch.setattr(schedule_store, "ENGINE_VERSION", pro.ENGINE_VERSION)
+    with ScheduleStore(path) as store:
+        assert store.get(key) is None                           # deleted by purge
+
+def test_integers_too_long_for_sqlite(tmp_path):
+    # the hyperperiod of many coprime periods, or a time past 2**63 : kept in memory only, the run goes on
+    path = str(tmp_path / "schedules.sqlite3")
+    result = pro.rm_scheduling(build(TASKS))
+    huge = pro.ScheduleResult(*result, **dict(vars(result), hyperperiod=10 ** 5000))
+    late = pro.ScheduleResult(result[0], 2 ** 64, result[2], result[3], **vars(result))
+    cache = ScheduleCache(store=ScheduleStore(path))
+    keys = [("huge", "rm", ()), ("late", "rm", ()), ("plain", "rm", ())]
+    for key, value in zip(keys, (huge, late, result)):
+        cache.put(key, value)
+    cache.close()
+    assert cache.store is not None
+    assert cache.get(keys[0]) is huge
+    with ScheduleStore(path) as store:
+        assert store.get(keys[0]) is None and store.get(keys[1]) is None
+        assert same_result(store.get(keys[2]), result)
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+import pygame
+
+class FontRegistry:
+    """
+    Fonts of the game, loaded once and shared by every window.
+    pygame.SysFont looks the font up among the system fonts, too slow to be called every frame.
+    The fonts can't be used after pygame.quit : the registry, and the TextCache it is given, are cleared then.
+
+    Attributes:
+        fonts: {(name, size, bold, italic): Font}.
+        text_cache: TextCache emptied with the fonts, or None.
+
+    Methods:
+        get(name=None, size=24, bold=False, italic=False): Returns the font, loaded on first use.
+            name None is the default font of pygame, a name ending with .ttf / .otf a font file, any other name
+            a system font.
+        clear(): Forgets every font.
+    """
+    def __init__(self, text_cache=None):
+        self.fonts = {}
+        self.text_cache = text_cache
+        self.registered = False     # clear is registered to be called by pygame.quit
+
+    def get(self, name=None, size=24, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if not self.registered:
+                pygame.register_quit(self.clear)
+                self.registered = True
+            if name is None or name.lower().endswith((".ttf", ".otf")):
+                font = pygame.font.Font(name, size)
+                font.set_bold(bold)
+                font.set_italic(italic)
+            else:
+                font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+            self.fonts[key] = font
+        return font
+
+    def clear(self):
+        self.fonts.clear()
+        self.registered = False     # pygame.quit forgets the functions it called
+        if self.text_cache is not None:
+            self.text_cache.clear()
+
+class TextCache:
+    """
+    LRU cache of rendered texts, keyed by (font, text, antialias, color, background).
+    A text that changes gets a new entry and the old one is evicted once unused, so the widgets can render their
+    data every frame : only the new strings are rendered. The cached surfaces are shared, they must not be modified.
+
+    Attributes:
+        max_entries: Maximum number of surfaces kept.
+        max_bytes: Maximum memory used by the surfaces kept.
+        size: Memory used by the surfaces kept.
+        hits: Number of texts found in the cache.
+        misses: Number of texts that had to be rendered.
+        evictions: Number of surfaces evicted.
+
+    Methods:
+        render(font, text, color, background=None, antialias=True): Returns the surface of the text, rendered
+            by font.render on first use.
+        invalidate(font): Forgets the texts of a font.
+        clear(): Empties the cache.
+        stats(): Returns the counters as a dict.
+    """
+    def __init__(self, max_entries=2048, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()    # key -> surface, from the least to the most recently used
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, background=None, antialias=True):
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.entries[key] = surface
+        self.size += _surface_size(surface)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= _surface_size(evicted)
+            self.evictions += 1
+        return surface
+
+    def invalidate(self, font):
+        for key in [key for key in self.entries if key[0] is font]:
+            self.size -= _surface_size(self.entries.pop(key))
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+    def __len__(self):
+        return len(self.entries)
+
+def _surface_size(surface):
+    return surface.get_height() * surface.get_pitch()
+
+# shared by every window of the game
+default_text_cache = TextCache()
+default_fonts = FontRegistry(default_text_cache)
+
+def get_font(name=None, size=24, bold=False, italic=False):
+    return default_fonts.get(name, size, bold, italic)
+
+def render_text(font, text, color, background=None, antialias=True):
+    return default_text_cache.render(font, text, color, background, antialias)
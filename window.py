@@ -1,26 +1,34 @@
 import game_component as gc
+from scene_manager import SceneManager
+
+# the single window of the game and its stack of screens, see scene_manager.SceneManager
+manager = SceneManager()
 
 def custom_process_window():
-    process_creator = gc.ProcessCreator()
-    process_creator.run()
+    manager.push(gc.ProcessCreator())
 
 def process_window_with_difficulty(difficulty):
     process_creator = gc.ProcessClass()
     process_creator.set_difficulty(difficulty)
-    process_creator.run()
+    manager.push(process_creator)
 
 def process_windows_with_custom(data):
+    # the game takes the place of the form, its Back button goes to the menu
     process_creator = gc.ProcessClass()
     process_creator.set_custom(True,data)
-    process_creator.run()
+    manager.replace(process_creator)
 
 def help_window():
-    help = gc.Help()
-    help.run()
+    manager.push(gc.Help())
 
 def main_window():
-    game = gc.SchedulingMaster()
-    game.run()
+    # opens the menu at startup, otherwise goes back to it
+    if not manager.scenes:
+        manager.run(gc.SchedulingMaster())
+        return
+    manager.pop_to_root()
+    if not isinstance(manager.scenes[0], gc.SchedulingMaster):
+        manager.replace(gc.SchedulingMaster())
 
 if __name__ == "__main__":
-    main_window()
\ No newline at end of file
+    main_window()